@@ -2,24 +2,49 @@
 """
 Migration Runner for 022_ingestion_cache.sql
 Executes the SQL migration to set up L2 cache table via Supabase REST API
+
+Progress is checkpointed to .migration-022.state after every batch, so a
+re-run resumes after the last statement that succeeded. Use --from N to
+start at a given statement and --dry-run to only list the statements.
 """
 
 import os
 import sys
+import re
+import random
 import json
+import argparse
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Load environment
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    print("❌ Missing SUPABASE_URL or SUPABASE_SERVICE_KEY")
-    sys.exit(1)
+try:
+    import sqlparse
+    HAS_SQLPARSE = True
+except ImportError:
+    HAS_SQLPARSE = False
+
+DOLLAR_QUOTE = re.compile(r'\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$')
+
+parser = argparse.ArgumentParser(description="Run migration 022_ingestion_cache.sql via the Supabase exec_sql RPC")
+parser.add_argument('--from', dest='start', type=int, metavar='N',
+                    help="start at statement N (1-based), ignoring the saved progress")
+parser.add_argument('--dry-run', action='store_true',
+                    help="list the parsed statements without executing them")
+args = parser.parse_args()
 
 # Read migration file
 migration_path = Path(__file__).parent / 'migrations' / '022_ingestion_cache.sql'
+state_path = Path(__file__).parent / '.migration-022.state'
 
 if not migration_path.exists():
     print(f"❌ Migration file not found: {migration_path}")
@@ -28,11 +53,111 @@ if not migration_path.exists():
 sql_content = migration_path.read_text()
 print(f"📄 Read migration file ({len(sql_content)} bytes)")
 
-# Parse SQL statements (simple split on ;)
-statements = [s.strip() for s in sql_content.split(';') if s.strip() and not s.strip().startswith('--')]
+def split_sql(sql):
+    """Split SQL on ';' outside string literals, comments and $tag$ bodies"""
+    parts, start, i, n = [], 0, 0, len(sql)
+    while i < n:
+        if sql[i] in ("'", '"'):
+            # A doubled quote ('') simply closes and reopens the literal
+            end = sql.find(sql[i], i + 1)
+            i = n if end == -1 else end + 1
+        elif sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = n if end == -1 else end + 1
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif sql[i] == '$' and DOLLAR_QUOTE.match(sql, i):
+            tag = DOLLAR_QUOTE.match(sql, i).group(0)
+            end = sql.find(tag, i + len(tag))
+            i = n if end == -1 else end + len(tag)
+        elif sql[i] == ';':
+            parts.append(sql[start:i])
+            i += 1
+            start = i
+        else:
+            i += 1
+    parts.append(sql[start:])
+    return parts
+
+
+def strip_leading_comments(statement):
+    """Drop the '--' comment lines that precede a statement"""
+    lines = statement.strip().split('\n')
+    while lines and (not lines[0].strip() or lines[0].strip().startswith('--')):
+        lines.pop(0)
+    return '\n'.join(lines).strip()
+
+
+# Parse SQL statements; a plain split on ';' would cut the $$-quoted
+# function bodies apart, so use sqlparse (or the equivalent split_sql)
+raw_statements = sqlparse.split(sql_content) if HAS_SQLPARSE else split_sql(sql_content)
+statements = [s for s in (strip_leading_comments(r).rstrip(';').strip() for r in raw_statements) if s]
 
 print(f"\n📝 Found {len(statements)} SQL statements\n")
 
+
+def classify(statement):
+    """Return (kind, idempotent) for a statement.
+
+    kind is 'ddl' or 'dml'; idempotent statements can be replayed safely
+    when resuming a partially applied migration.
+    """
+    upper = ' '.join(statement.upper().split())
+    kind = 'ddl' if upper.startswith(('CREATE', 'ALTER', 'DROP', 'COMMENT', 'GRANT')) else 'dml'
+    idempotent = (
+        'IF NOT EXISTS' in upper
+        or 'IF EXISTS' in upper
+        or upper.startswith(('CREATE OR REPLACE', 'COMMENT ON', 'GRANT'))
+    )
+    return kind, idempotent
+
+
+def preview_of(statement):
+    """One-line preview of a statement for logging"""
+    preview = statement[:80].replace('\n', ' ')
+    if len(statement) > 80:
+        preview += '...'
+    return preview
+
+
+# Work out where to start: --from wins over the saved progress
+if args.start is not None:
+    if not 1 <= args.start <= len(statements):
+        print(f"❌ --from must be between 1 and {len(statements)}")
+        sys.exit(1)
+    start = args.start
+elif state_path.exists():
+    start = int(state_path.read_text().strip() or 0) + 1
+    print(f"↪️  Resuming after statement {start - 1} (from {state_path.name})\n")
+else:
+    start = 1
+
+if args.dry_run:
+    for i, statement in enumerate(statements, 1):
+        kind, idempotent = classify(statement)
+        tag = 'skip' if i < start else 'run '
+        flag = 'idempotent' if idempotent else 'NOT idempotent'
+        print(f"[{i}/{len(statements)}] {tag} {kind.upper()} ({flag}): {preview_of(statement)}")
+    sys.exit(0)
+
+if start > len(statements):
+    print("✅ All statements already applied - nothing to do")
+    print(f"   Re-run with --from 1 (or delete {state_path.name}) to execute them again")
+    sys.exit(0)
+
+for i, statement in enumerate(statements[start - 1:], start):
+    if not classify(statement)[1]:
+        print(f"⚠️  Statement {i} is not idempotent and will fail if already applied: {preview_of(statement)}")
+
+# Load environment
+SUPABASE_URL = os.getenv('SUPABASE_URL')
+SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
+
+if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+    print("❌ Missing SUPABASE_URL or SUPABASE_SERVICE_KEY")
+    sys.exit(1)
+
 # Set up headers
 headers = {
     'Content-Type': 'application/json',
@@ -40,58 +165,193 @@ headers = {
     'apikey': SUPABASE_SERVICE_KEY,
 }
 
-# Execute each statement via pg_trgm or direct connection
+# Execute the migration via the exec_sql RPC.
 # Since Supabase doesn't expose raw SQL execution via REST by default,
-# we'll use the query endpoint with the postgres rpc function if available
+# this requires the exec_sql postgres function to be installed.
+# Postgres parses multiple statements per call, so the whole file is sent
+# in batches; statements are only sent one by one when a batch fails, to
+# localize the offending statement.
 
-success_count = 0
-failed_count = 0
+rpc_url = f"{SUPABASE_URL}/rest/v1/rpc/exec_sql"
+BATCH_SIZE = 50
+MAX_WORKERS = 4
 
-for i, statement in enumerate(statements, 1):
-    preview = statement[:80].replace('\n', ' ')
-    if len(statement) > 80:
-        preview += '...'
-    
-    print(f"[{i}/{len(statements)}] Executing: {preview}")
-    
-    # Try using the SQL query execution endpoint
-    # Note: This assumes pgAdmin or similar is available
-    # For production, you might want to use Supabase Studio directly
-    
+# Statements that only decorate objects created earlier and never depend
+# on each other; these can be sent concurrently once every other
+# statement of the batch has run.
+INDEPENDENT_PREFIXES = ('CREATE INDEX', 'CREATE UNIQUE INDEX', 'COMMENT ON', 'GRANT')
+
+
+# Log lines of the request running on this thread; retries are reported
+# there so they stay with the statement's output instead of interleaving
+_retry_log = threading.local()
+
+
+class LoggingRetry(Retry):
+    """Retry policy that logs each retry and adds jitter to the backoff"""
+
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        # Raises once the retries are exhausted: only log real new attempts
+        new_retry = super().increment(method, url, response, error, *args, **kwargs)
+        reason = response.status if response is not None else error
+        _retry_log.lines.append(f"   🔁 Transient failure ({reason}) on {method} {url}, retrying...")
+        return new_retry
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, backoff)
+
+
+# Supabase answers 429 under load and 503 while its gateway restarts; both
+# mean the statement was not run, so they are retried with exponential
+# backoff. 502/504 can arrive after the statement committed, and replaying
+# a non-idempotent DDL statement would apply it twice: those are not retried.
+RETRY_STATUSES = [429, 503]
+# Statuses that mean the server is throttling or unreachable; after the
+# retries, falling back to one request per statement would only make it worse
+UNAVAILABLE_STATUSES = (429, 502, 503, 504)
+
+retry = LoggingRetry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=RETRY_STATUSES,
+    allowed_methods=['POST'],
+    raise_on_status=False,
+)
+
+# One keep-alive session for every request, so the TLS handshake with
+# Supabase is paid once; the pool is sized for the concurrent workers.
+session = requests.Session()
+session.headers.update(headers)
+session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retry))
+session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retry))
+
+
+def exec_sql(sql, lines):
+    """POST a SQL payload to the exec_sql RPC and return the response.
+
+    Retries are logged to lines, the caller's buffered output.
+    """
+    payload = {
+        'sql_content': sql
+    }
+    body = orjson.dumps(payload) if HAS_ORJSON else json.dumps(payload).encode('utf-8')
+    _retry_log.lines = lines
     try:
-        # Attempt 1: Use RPC if available
-        rpc_url = f"{SUPABASE_URL}/rest/v1/rpc/exec_sql"
-        payload = {
-            'sql_content': statement
-        }
-        
-        response = requests.post(rpc_url, json=payload, headers=headers, timeout=10)
-        
-        if response.status_code in [200, 201]:
-            print(f"   ✅ Success")
-            success_count += 1
-        elif response.status_code == 404:
-            # RPC not available, will need manual execution
-            print(f"   ⚠️  RPC endpoint not available (404)")
-            print(f"   ℹ️  Run manually in Supabase Studio or pgAdmin")
-            failed_count += 1
-        else:
-            print(f"   ❌ Error: {response.status_code}")
-            print(f"   Response: {response.text[:200]}")
-            failed_count += 1
-            
+        return session.post(rpc_url, data=body, timeout=10)
+    finally:
+        _retry_log.lines = None
+
+
+def describe_failure(response):
+    """Return the log lines explaining why a request failed"""
+    if response.status_code == 404:
+        # RPC not available, will need manual execution
+        return [
+            f"   ⚠️  RPC endpoint not available (404)",
+            f"   ℹ️  Run manually in Supabase Studio or pgAdmin",
+        ]
+    return [
+        f"   ❌ Error: {response.status_code}",
+        f"   Response: {response.text[:200]}",
+    ]
+
+
+def execute_one(index, statement):
+    """Execute a single statement, returning (success, log lines)"""
+    lines = [f"[{index}/{len(statements)}] Executing: {preview_of(statement)}"]
+
+    try:
+        response = exec_sql(statement, lines)
     except Exception as e:
-        print(f"   ❌ Exception: {str(e)}")
-        failed_count += 1
+        lines.append(f"   ❌ Exception: {str(e)}")
+        return False, lines
+
+    if response.status_code in [200, 201]:
+        lines.append(f"   ✅ Success")
+        return True, lines
+
+    lines.extend(describe_failure(response))
+    return False, lines
+
+
+def execute_each(numbered):
+    """Execute (index, statement) pairs one by one, returning the indexes that succeeded.
+
+    Dependent statements run sequentially in file order; the independent
+    ones (indexes, comments, grants) then run concurrently. Output is
+    printed in submission order regardless of completion order.
+    """
+    sequential = [(i, s) for i, s in numbered if not s.upper().startswith(INDEPENDENT_PREFIXES)]
+    independent = [(i, s) for i, s in numbered if s.upper().startswith(INDEPENDENT_PREFIXES)]
+
+    outcomes = [execute_one(i, s) for i, s in sequential]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        outcomes.extend(executor.map(lambda pair: execute_one(*pair), independent))
+
+    for _, lines in outcomes:
+        print('\n'.join(lines))
+
+    indexes = [i for i, _ in sequential + independent]
+    return {i for i, (ok, _) in zip(indexes, outcomes) if ok}
+
+
+pending = list(enumerate(statements, 1))[start - 1:]
+succeeded = set()
+completed = start - 1  # statements 1..completed are known to be applied
+
+for batch_start in range(0, len(pending), BATCH_SIZE):
+    batch = pending[batch_start:batch_start + BATCH_SIZE]
+    first, last = batch[0][0], batch[-1][0]
+
+    print(f"[{first}-{last}/{len(statements)}] Executing batch of {len(batch)} statements")
+
+    retry_lines = []
+    try:
+        response = exec_sql(';\n'.join(s for _, s in batch) + ';', retry_lines)
+    except Exception as e:
+        retry_lines.append(f"   ❌ Exception: {str(e)}")
+        response = None
+    if retry_lines:
+        print('\n'.join(retry_lines))
+
+    if response is not None and response.status_code in [200, 201]:
+        print(f"   ✅ Success")
+        succeeded.update(i for i, _ in batch)
+    elif response is not None and response.status_code == 404:
+        # No point retrying statement by statement without the RPC
+        print('\n'.join(describe_failure(response)))
+    elif response is not None and response.status_code in UNAVAILABLE_STATUSES:
+        # Still throttled or unreachable after the retries: one request per
+        # statement would only add load, so stop here and resume later
+        print('\n'.join(describe_failure(response)))
+        print(f"   ⏸️  Server unavailable, stopping after statement {completed}")
+        state_path.write_text(str(completed))
+        break
+    else:
+        if response is not None:
+            print('\n'.join(describe_failure(response)))
+        print(f"   ↩️  Falling back to per-statement execution\n")
+        succeeded.update(execute_each(batch))
+
+    # Checkpoint the longest run of applied statements from the start
+    while completed + 1 in succeeded:
+        completed += 1
+    state_path.write_text(str(completed))
+
+success_count = len(succeeded)
+failed_count = len(pending) - success_count
 
 print(f"\n{'='*60}")
 print(f"📊 Migration Summary:")
 print(f"   ✅ Successful: {success_count}")
 print(f"   ❌ Failed: {failed_count}")
-print(f"   📋 Total: {len(statements)}")
+print(f"   📋 Total: {len(pending)}")
+if start > 1:
+    print(f"   ⏭️  Skipped: {start - 1} (already applied)")
 print(f"{'='*60}")
 
-if failed_count == len(statements):
+if failed_count == len(pending):
     print("\n⚠️  WARNING: All statements failed - RPC endpoint may not be available")
     print("\n📌 MANUAL EXECUTION:")
     print("   1. Go to: https://app.supabase.com/project/*/sql/new")
@@ -100,6 +360,7 @@ if failed_count == len(statements):
     sys.exit(0)  # Don't fail - user can run manually
 elif failed_count > 0:
     print(f"\n⚠️  {failed_count} statements need manual review")
+    print(f"   Re-run to resume from statement {completed + 1}")
     sys.exit(0)
 else:
     print("\n✅ All migrations executed successfully!")
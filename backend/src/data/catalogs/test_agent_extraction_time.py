@@ -4,20 +4,113 @@ Test Ingestion Accelerator Agent Extraction Time
 Measures end-to-end performance of catalog ingestion via the API
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import csv
+import gzip
+import io
+import random
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+# Streaming PDF uploads need requests-toolbelt (pip install requests-toolbelt);
+# without it the multipart body is built in memory before the upload
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    HAS_TOOLBELT = True
+except ImportError:
+    HAS_TOOLBELT = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _json_loads(data):
+    """Parse JSON bytes, with orjson when available"""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+def _json_dumps(obj):
+    """Serialize to JSON bytes, with orjson when available"""
+    return orjson.dumps(obj) if HAS_ORJSON else json.dumps(obj).encode('utf-8')
+
+@lru_cache(maxsize=64)
+def _load_catalog(path, fmt):
+    """Read a catalog once per process: parsed JSON, or the CSV text"""
+    data = Path(path).read_bytes()
+    return _json_loads(data) if fmt == 'json' else data.decode('utf-8')
+
+def _count_csv_rows(csv_content):
+    """Count data rows, excluding the header and honouring quoted newlines"""
+    return max(sum(1 for _ in csv.reader(io.StringIO(csv_content))) - 1, 0)
+
+def _throughput(count, seconds):
+    """Items per second, 0 when the elapsed time is too small to measure"""
+    return count / seconds if seconds > 1e-9 else 0.0
+
+class LoggingRetry(Retry):
+    """Retry policy that logs each retry and adds jitter to the backoff"""
+    
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        reason = response.status if response is not None else error
+        print(f"   🔁 Transient failure ({reason}) on {method} {url}, retrying...")
+        return super().increment(method, url, response, error, *args, **kwargs)
+    
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, backoff)
+
+@dataclass(slots=True)
+class Run:
+    """One measured catalog extraction"""
+    fmt: str
+    file: str
+    products: int
+    time: float
+    throughput: float
+
+# Catalogs live next to this script, so the test runs from any checkout
+HERE = Path(__file__).resolve().parent
+
+# Catalogs measured concurrently per format (requests are I/O-bound)
+MAX_WORKERS = 8
+
+# JSON bodies larger than this are sent gzip-compressed
+GZIP_MIN_BYTES = 10 * 1024
+
 class AgentExtractionTester:
     def __init__(self, api_url="http://localhost:3001"):
         self.api_url = api_url
-        self.results = {
-            'json': [],
-            'csv': [],
-            'pdf': [],
-        }
+        self.runs = []
+        # Whether the backend has /extract-batch; None until probed
+        self.batch_supported = None
+        # The health check retries throttling (429) and gateway errors with
+        # backoff
         self.session = requests.Session()
+        retry = LoggingRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=['GET'],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=16, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Measured requests never retry: backoff sleeps would land inside the
+        # timed window, and a streamed upload cannot be rewound to be resent.
+        # Pool sized above MAX_WORKERS so concurrent requests never wait on a
+        # connection.
+        self.timed_session = requests.Session()
+        timed_adapter = HTTPAdapter(pool_maxsize=16, max_retries=0)
+        self.timed_session.mount('http://', timed_adapter)
+        self.timed_session.mount('https://', timed_adapter)
     
     def check_api_health(self):
         """Check if backend is running"""
@@ -38,70 +131,233 @@ class AgentExtractionTester:
             print(f"  Make sure backend is running on {self.api_url}")
             return False
     
+    def _run_concurrently(self, catalogs, measure):
+        """Measure catalogs in parallel, printing their output in order"""
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for lines, run in executor.map(measure, catalogs):
+                print("\n".join(lines))
+                if run is not None:
+                    self.runs.append(run)
+    
+    def _post_json(self, endpoint, payload, timeout):
+        """POST a JSON payload, gzip-compressing bodies above GZIP_MIN_BYTES"""
+        body = _json_dumps(payload)
+        headers = {'Content-Type': 'application/json'}
+        
+        if len(body) > GZIP_MIN_BYTES:
+            # express.json() inflates gzip request bodies transparently
+            body = gzip.compress(body, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        
+        return self.timed_session.post(
+            f"{self.api_url}{endpoint}",
+            data=body,
+            headers=headers,
+            timeout=timeout
+        )
+    
+    def _measure_json(self, catalog_path):
+        """Extract one JSON catalog, returning (output lines, Run or None)"""
+        out = []
+        path = Path(catalog_path)
+        name = path.name
+        if not path.exists():
+            out.append(f"⚠ {name} not found")
+            return out, None
+        
+        try:
+            catalog_data = _load_catalog(path, 'json')
+            
+            out.append(f"\n📦 Testing: {name}")
+            
+            # Measure extraction time
+            start_time = time.perf_counter()
+            
+            try:
+                response = self._post_json(
+                    "/api/ingestion/extract",
+                    {
+                        'catalog': catalog_data,
+                        'format': 'json',
+                        'source': name
+                    },
+                    timeout=30
+                )
+                
+                elapsed = time.perf_counter() - start_time
+                
+                if response.status_code in [200, 201]:
+                    result = _json_loads(response.content)
+                    products_count = result.get('extracted_count', len(catalog_data.get('products', [])))
+                    
+                    throughput = _throughput(products_count, elapsed)
+                    
+                    out.append(f"  ✓ Extraction time: {elapsed:.3f}s")
+                    out.append(f"    Products extracted: {products_count}")
+                    out.append(f"    Throughput: {throughput:.0f} products/sec")
+                    
+                    return out, Run('json', name, products_count, elapsed, throughput)
+                else:
+                    out.append(f"  ✗ API Error: {response.status_code}")
+                    out.append(f"    Response: {response.text[:100]}")
+            
+            except requests.exceptions.Timeout:
+                out.append(f"  ✗ Request timeout (>30s)")
+            except requests.exceptions.ConnectionError as e:
+                out.append(f"  ✗ Connection error: {str(e)[:50]}")
+        
+        except Exception as e:
+            out.append(f"  ✗ Error: {str(e)[:50]}")
+        
+        return out, None
+    
+    def _batch_endpoint_available(self):
+        """Probe extract-batch once with an empty body, before uploading any catalog"""
+        if self.batch_supported is None:
+            try:
+                response = self._post_json("/api/ingestion/extract-batch", {'items': []}, timeout=5)
+                self.batch_supported = response.status_code != 404
+            except requests.exceptions.RequestException:
+                self.batch_supported = False
+        return self.batch_supported
+    
+    def _measure_json_batch(self, json_catalogs):
+        """Extract all JSON catalogs in one extract-batch request.
+        
+        Returns False when the batch endpoint is not available or the
+        batch fails, so the caller can fall back to one request per catalog.
+        """
+        if not self._batch_endpoint_available():
+            print("\n⚠ Batch endpoint not available, extracting one catalog at a time")
+            return False
+        
+        # Missing catalogs are reported by the per-catalog path only
+        items = [
+            {'catalog': _load_catalog(path, 'json'), 'format': 'json', 'source': path.name}
+            for path in map(Path, json_catalogs) if path.exists()
+        ]
+        
+        if not items:
+            return True
+        
+        print(f"\n📦 Testing batch of {len(items)} catalogs")
+        
+        # Measure extraction time
+        start_time = time.perf_counter()
+        
+        try:
+            response = self._post_json(
+                "/api/ingestion/extract-batch",
+                {'items': items},
+                timeout=60
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"  ✗ Batch request failed: {str(e)[:50]}")
+            return False
+        
+        elapsed = time.perf_counter() - start_time
+        
+        if response.status_code == 404:
+            self.batch_supported = False
+            print("  ⚠ Batch endpoint not available, extracting one catalog at a time")
+            return False
+        
+        if response.status_code not in [200, 201]:
+            print(f"  ✗ API Error: {response.status_code}, extracting one catalog at a time")
+            print(f"    Response: {response.text[:100]}")
+            return False
+        
+        try:
+            body = _json_loads(response.content)
+        except ValueError:
+            print("  ✗ Batch response is not JSON, extracting one catalog at a time")
+            return False
+        
+        # Use per-item counts/timings when the server reports them, otherwise
+        # split the batch time evenly across the catalogs
+        per_item = body.get('results') if isinstance(body, dict) else None
+        if not isinstance(per_item, list):
+            per_item = []
+        for i, item in enumerate(items):
+            item_result = per_item[i] if i < len(per_item) and isinstance(per_item[i], dict) else {}
+            products_count = item_result.get('extracted_count', len(item['catalog'].get('products', [])))
+            item_time = item_result.get('time_ms', elapsed / len(items) * 1000) / 1000
+            
+            print(f"\n  • {item['source']}")
+            print(f"    Extraction time: {item_time:.3f}s")
+            print(f"    Products extracted: {products_count}")
+            
+            self.runs.append(Run('json', item['source'], products_count, item_time, _throughput(products_count, item_time)))
+        
+        print(f"\n  ✓ Batch extraction time: {elapsed:.3f}s")
+        return True
+    
     def test_json_extraction(self):
         """Test JSON catalog extraction time"""
         print("\n" + "="*60)
         print("⏱ TESTING JSON EXTRACTION TIME")
         print("="*60)
         
-        json_catalogs = [
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\python_packages_catalog.json",
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\npm_packages_catalog.json",
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\cloud_services_catalog.json",
-        ]
+        json_catalogs = sorted((HERE / "real").glob("*_catalog.json"))
         
-        for catalog_path in json_catalogs:
-            if not Path(catalog_path).exists():
-                print(f"⚠ {Path(catalog_path).name} not found")
-                continue
+        if not self._measure_json_batch(json_catalogs):
+            self._run_concurrently(json_catalogs, self._measure_json)
+    
+    def _measure_csv(self, catalog_path):
+        """Extract one CSV catalog, returning (output lines, Run or None)"""
+        out = []
+        path = Path(catalog_path)
+        name = path.name
+        if not path.exists():
+            out.append(f"⚠ {name} not found")
+            return out, None
+        
+        try:
+            csv_content = _load_catalog(path, 'csv')
+            
+            out.append(f"\n📦 Testing: {name}")
+            
+            # Measure extraction time
+            start_time = time.perf_counter()
             
             try:
-                with open(catalog_path, 'r', encoding='utf-8') as f:
-                    catalog_data = json.load(f)
-                
-                print(f"\n📦 Testing: {Path(catalog_path).name}")
+                response = self._post_json(
+                    "/api/ingestion/extract",
+                    {
+                        'content': csv_content,
+                        'format': 'csv',
+                        'source': name
+                    },
+                    timeout=30
+                )
                 
-                # Measure extraction time
-                start_time = time.time()
+                elapsed = time.perf_counter() - start_time
                 
-                try:
-                    response = self.session.post(
-                        f"{self.api_url}/api/ingestion/extract",
-                        json={
-                            'catalog': catalog_data,
-                            'format': 'json',
-                            'source': Path(catalog_path).name
-                        },
-                        timeout=30
-                    )
+                if response.status_code in [200, 201]:
+                    result = _json_loads(response.content)
+                    products_count = result.get('extracted_count')
+                    if products_count is None:
+                        products_count = _count_csv_rows(csv_content)
                     
-                    elapsed = time.time() - start_time
+                    throughput = _throughput(products_count, elapsed)
                     
-                    if response.status_code in [200, 201]:
-                        result = response.json()
-                        products_count = result.get('extracted_count', len(catalog_data.get('products', [])))
-                        
-                        print(f"  ✓ Extraction time: {elapsed:.3f}s")
-                        print(f"    Products extracted: {products_count}")
-                        print(f"    Throughput: {products_count/elapsed:.0f} products/sec")
-                        
-                        self.results['json'].append({
-                            'file': Path(catalog_path).name,
-                            'products': products_count,
-                            'time': elapsed,
-                            'throughput': products_count/elapsed
-                        })
-                    else:
-                        print(f"  ✗ API Error: {response.status_code}")
-                        print(f"    Response: {response.text[:100]}")
-                
-                except requests.exceptions.Timeout:
-                    print(f"  ✗ Request timeout (>30s)")
-                except requests.exceptions.ConnectionError as e:
-                    print(f"  ✗ Connection error: {str(e)[:50]}")
+                    out.append(f"  ✓ Extraction time: {elapsed:.3f}s")
+                    out.append(f"    Products extracted: {products_count}")
+                    out.append(f"    Throughput: {throughput:.0f} products/sec")
+                    
+                    return out, Run('csv', name, products_count, elapsed, throughput)
+                else:
+                    out.append(f"  ✗ API Error: {response.status_code}")
             
-            except Exception as e:
-                print(f"  ✗ Error: {str(e)[:50]}")
+            except requests.exceptions.Timeout:
+                out.append(f"  ✗ Request timeout (>30s)")
+            except requests.exceptions.ConnectionError:
+                out.append(f"  ✗ Connection error")
+        
+        except Exception as e:
+            out.append(f"  ✗ Error: {str(e)[:50]}")
+        
+        return out, None
     
     def test_csv_extraction(self):
         """Test CSV catalog extraction time"""
@@ -109,63 +365,74 @@ class AgentExtractionTester:
         print("⏱ TESTING CSV EXTRACTION TIME")
         print("="*60)
         
-        csv_catalogs = [
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\csv\\electronics_products.csv",
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\csv\\cloud_services.csv",
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\csv\\saas_software.csv",
-        ]
+        csv_catalogs = sorted((HERE / "csv").glob("*.csv"))
+        
+        self._run_concurrently(csv_catalogs, self._measure_csv)
+    
+    def _prepare_pdf(self, filename, fileobj):
+        """Build the multipart PDF upload, ready to be sent by the timed session.
         
-        for catalog_path in csv_catalogs:
-            if not Path(catalog_path).exists():
-                print(f"⚠ {Path(catalog_path).name} not found")
-                continue
+        With requests-toolbelt the body streams from the open file as it is
+        sent, in constant memory; otherwise preparing the request reads the
+        whole file here, before the caller starts its timer.
+        """
+        url = f"{self.api_url}/api/ingestion/extract-pdf"
+        fields = {'file': (filename, fileobj, 'application/pdf')}
+        
+        if HAS_TOOLBELT:
+            encoder = MultipartEncoder(fields=fields)
+            request = requests.Request('POST', url, data=encoder, headers={'Content-Type': encoder.content_type})
+        else:
+            request = requests.Request('POST', url, files=fields)
+        
+        return self.timed_session.prepare_request(request)
+    
+    def _measure_pdf(self, catalog_path):
+        """Extract one PDF catalog, returning (output lines, Run or None)"""
+        out = []
+        path = Path(catalog_path)
+        name = path.name
+        if not path.exists():
+            out.append(f"⚠ {name} not found")
+            return out, None
+        
+        try:
+            out.append(f"\n📦 Testing: {name}")
             
             try:
-                with open(catalog_path, 'r', encoding='utf-8') as f:
-                    csv_content = f.read()
-                
-                print(f"\n📦 Testing: {Path(catalog_path).name}")
-                
-                # Measure extraction time
-                start_time = time.time()
+                with open(catalog_path, 'rb') as f:
+                    request = self._prepare_pdf(name, f)
+                    
+                    # Measure extraction time, from the send on (with
+                    # requests-toolbelt the file is read as it is streamed)
+                    start_time = time.perf_counter()
+                    response = self.timed_session.send(request, timeout=30)
+                    elapsed = time.perf_counter() - start_time
                 
-                try:
-                    response = self.session.post(
-                        f"{self.api_url}/api/ingestion/extract",
-                        json={
-                            'content': csv_content,
-                            'format': 'csv',
-                            'source': Path(catalog_path).name
-                        },
-                        timeout=30
-                    )
+                if response.status_code in [200, 201]:
+                    result = _json_loads(response.content)
+                    products_count = result.get('extracted_count', 0)
                     
-                    elapsed = time.time() - start_time
+                    throughput = _throughput(products_count, elapsed)
                     
-                    if response.status_code in [200, 201]:
-                        result = response.json()
-                        products_count = result.get('extracted_count', csv_content.count('\n'))
-                        
-                        print(f"  ✓ Extraction time: {elapsed:.3f}s")
-                        print(f"    Products extracted: {products_count}")
-                        print(f"    Throughput: {products_count/elapsed:.0f} products/sec")
-                        
-                        self.results['csv'].append({
-                            'file': Path(catalog_path).name,
-                            'products': products_count,
-                            'time': elapsed,
-                            'throughput': products_count/elapsed if elapsed > 0 else 0
-                        })
-                    else:
-                        print(f"  ✗ API Error: {response.status_code}")
-                
-                except requests.exceptions.Timeout:
-                    print(f"  ✗ Request timeout (>30s)")
-                except requests.exceptions.ConnectionError:
-                    print(f"  ✗ Connection error")
+                    out.append(f"  ✓ Extraction time: {elapsed:.3f}s")
+                    out.append(f"    Products extracted: {products_count}")
+                    if products_count > 0:
+                        out.append(f"    Throughput: {throughput:.0f} products/sec")
+                    
+                    return out, Run('pdf', name, products_count, elapsed, throughput)
+                else:
+                    out.append(f"  ✗ API Error: {response.status_code}")
             
-            except Exception as e:
-                print(f"  ✗ Error: {str(e)[:50]}")
+            except requests.exceptions.Timeout:
+                out.append(f"  ✗ Request timeout (>30s)")
+            except requests.exceptions.ConnectionError:
+                out.append(f"  ✗ Connection error")
+        
+        except Exception as e:
+            out.append(f"  ✗ Error: {str(e)[:50]}")
+        
+        return out, None
     
     def test_pdf_extraction(self):
         """Test PDF catalog extraction time"""
@@ -173,60 +440,9 @@ class AgentExtractionTester:
         print("⏱ TESTING PDF EXTRACTION TIME")
         print("="*60)
         
-        pdf_catalogs = [
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\pdf\\Tech_Products_Catalog_2026.pdf",
-            "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\pdf\\Cloud_Services_Pricing_2026.pdf",
-        ]
+        pdf_catalogs = sorted((HERE / "pdf").glob("*.pdf"))
         
-        for catalog_path in pdf_catalogs:
-            if not Path(catalog_path).exists():
-                print(f"⚠ {Path(catalog_path).name} not found")
-                continue
-            
-            try:
-                with open(catalog_path, 'rb') as f:
-                    pdf_content = f.read()
-                
-                print(f"\n📦 Testing: {Path(catalog_path).name}")
-                
-                # Measure extraction time
-                start_time = time.time()
-                
-                try:
-                    files = {'file': (Path(catalog_path).name, pdf_content, 'application/pdf')}
-                    response = self.session.post(
-                        f"{self.api_url}/api/ingestion/extract-pdf",
-                        files=files,
-                        timeout=30
-                    )
-                    
-                    elapsed = time.time() - start_time
-                    
-                    if response.status_code in [200, 201]:
-                        result = response.json()
-                        products_count = result.get('extracted_count', 0)
-                        
-                        print(f"  ✓ Extraction time: {elapsed:.3f}s")
-                        print(f"    Products extracted: {products_count}")
-                        if products_count > 0:
-                            print(f"    Throughput: {products_count/elapsed:.0f} products/sec")
-                        
-                        self.results['pdf'].append({
-                            'file': Path(catalog_path).name,
-                            'products': products_count,
-                            'time': elapsed,
-                            'throughput': products_count/elapsed if elapsed > 0 else 0
-                        })
-                    else:
-                        print(f"  ✗ API Error: {response.status_code}")
-                
-                except requests.exceptions.Timeout:
-                    print(f"  ✗ Request timeout (>30s)")
-                except requests.exceptions.ConnectionError:
-                    print(f"  ✗ Connection error")
-            
-            except Exception as e:
-                print(f"  ✗ Error: {str(e)[:50]}")
+        self._run_concurrently(pdf_catalogs, self._measure_pdf)
     
     def generate_report(self):
         """Generate performance report"""
@@ -234,42 +450,20 @@ class AgentExtractionTester:
         print("📊 AGENT EXTRACTION PERFORMANCE REPORT")
         print("="*60)
         
-        total_products = 0
-        total_time = 0
-        test_count = 0
-        
-        print("\n📈 JSON EXTRACTIONS:")
-        if self.results['json']:
-            for test in self.results['json']:
-                print(f"  • {test['file']}")
-                print(f"    Time: {test['time']:.3f}s | Products: {test['products']} | Speed: {test['throughput']:.0f}/sec")
-                total_products += test['products']
-                total_time += test['time']
-                test_count += 1
-        else:
-            print("  (No results)")
-        
-        print("\n📈 CSV EXTRACTIONS:")
-        if self.results['csv']:
-            for test in self.results['csv']:
-                print(f"  • {test['file']}")
-                print(f"    Time: {test['time']:.3f}s | Products: {test['products']} | Speed: {test['throughput']:.0f}/sec")
-                total_products += test['products']
-                total_time += test['time']
-                test_count += 1
-        else:
-            print("  (No results)")
-        
-        print("\n📈 PDF EXTRACTIONS:")
-        if self.results['pdf']:
-            for test in self.results['pdf']:
-                print(f"  • {test['file']}")
-                print(f"    Time: {test['time']:.3f}s | Products: {test['products']} | Speed: {test['throughput']:.0f}/sec")
-                total_products += test['products']
-                total_time += test['time']
-                test_count += 1
-        else:
-            print("  (No results)")
+        by_format = {fmt: [run for run in self.runs if run.fmt == fmt] for fmt in ('json', 'csv', 'pdf')}
+        
+        for fmt, runs in by_format.items():
+            print(f"\n📈 {fmt.upper()} EXTRACTIONS:")
+            if runs:
+                for run in runs:
+                    print(f"  • {run.file}")
+                    print(f"    Time: {run.time:.3f}s | Products: {run.products} | Speed: {run.throughput:.0f}/sec")
+            else:
+                print("  (No results)")
+        
+        total_products = sum(run.products for run in self.runs)
+        total_time = sum(run.time for run in self.runs)
+        test_count = len(self.runs)
         
         if test_count > 0:
             print("\n" + "─"*60)
@@ -278,9 +472,9 @@ class AgentExtractionTester:
             print(f"  Total products extracted: {total_products}")
             print(f"  Total time: {total_time:.3f}s")
             print(f"  Average extraction time: {total_time/test_count:.3f}s per catalog")
-            print(f"  Average throughput: {total_products/total_time:.0f} products/second (Agent)")
+            print(f"  Average throughput: {_throughput(total_products, total_time):.0f} products/second (Agent)")
             
-            if total_time > 0:
+            if total_products > 0:
                 avg_product_time = (total_time / total_products) * 1000  # milliseconds
                 print(f"  Avg time per product: {avg_product_time:.1f}ms")
         
@@ -3,17 +3,139 @@
 End-to-End User Simulation Test
 Simula un utente che esegue il flusso completo: upload → ingestion → deduplication → validation
 """
+import os
 import json
 import time
 import csv
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict
 
+try:
+    import simdjson
+    HAS_SIMDJSON = True
+except ImportError:
+    HAS_SIMDJSON = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# ijson legge i cataloghi grandi a eventi (backend C yajl2 se presente),
+# senza materializzare l'intero array dei prodotti
+try:
+    import ijson.backends.yajl2_c as ijson
+    HAS_IJSON = True
+except ImportError:
+    try:
+        import ijson
+        HAS_IJSON = True
+    except ImportError:
+        HAS_IJSON = False
+
+STREAM_MIN_BYTES = 16 * 1024 * 1024
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+# Colonne CSV candidate per il nome prodotto, in ordine di priorita'
+NAME_COLUMNS = ('Product Name', 'Product', 'Service')
+
+EXTRACTION_COLUMNS = ('filename', 'format', 'products_extracted', 'extraction_time_ms', 'throughput')
+
+# Un parser simdjson per thread: il buffer interno viene riusato tra le
+# chiamate invece di essere riallocato, e i worker dell'estrazione
+# parallela non condividono lo stesso parser
+_local = threading.local()
+
+def _simdjson_parser():
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = simdjson.Parser()
+    return parser
+
+def load_json(path):
+    """Carica un catalogo JSON: simdjson (lazy), poi orjson, poi json standard"""
+    data = Path(path).read_bytes()
+    if HAS_SIMDJSON:
+        # Oggetti lazy: solo i campi letti vengono convertiti in Python
+        return _simdjson_parser().parse(data)
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def count_json_products(path, size):
+    """Conta i prodotti di un catalogo JSON, in streaming se il file e' grande"""
+    if HAS_IJSON and size >= STREAM_MIN_BYTES:
+        with open(path, 'rb') as f:
+            return sum(1 for _ in ijson.items(f, 'products.item', use_float=True))
+    return len(load_json(path).get('products', []))
+
+# Cartella dei cataloghi (quella dello script), indipendente dalla cwd e dal sistema
+HERE = Path(__file__).resolve().parent
+
+# Latenze simulate (rete, AI, database) disattivate di default, cosi' il
+# tempo misurato riflette solo il lavoro reale; E2E_SIMULATE_DELAYS=1 le
+# ripristina per le demo
+SIMULATE_DELAYS = os.getenv('E2E_SIMULATE_DELAYS', '0') not in ('', '0', 'false')
+
+def iter_product_names(catalog):
+    """Nomi dei prodotti di un catalogo caricato (JSON e CSV)"""
+    if catalog['format'] == 'json':
+        for product in load_json(catalog['path']).get('products', []):
+            name = product.get('name')
+            if name:
+                yield name
+    elif catalog['format'] == 'csv':
+        with open(catalog['path'], 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                name = next((row[c] for c in NAME_COLUMNS if row.get(c)), None)
+                if name:
+                    yield name
+
+def find_duplicates(catalogs):
+    """Raggruppa i prodotti per nome normalizzato in un solo passaggio.
+
+    Restituisce (prodotti unici, {nome: [file]}) con i soli nomi presenti
+    in piu' cataloghi. Con xxhash la chiave e' l'hash xxh3 a 64 bit del
+    nome; le collisioni vengono separate confrontando il nome stesso.
+    """
+    buckets = {}
+    for catalog in catalogs:
+        for name in iter_product_names(catalog):
+            normalized = name.strip().lower()
+            key = xxhash.xxh3_64_intdigest(normalized) if HAS_XXHASH else normalized
+            entries = buckets.setdefault(key, {})
+            entries.setdefault(normalized, (name, []))[1].append(catalog['file'])
+    
+    unique = 0
+    duplicates = {}
+    for entries in buckets.values():
+        unique += len(entries)
+        for name, sources in entries.values():
+            if len(set(sources)) > 1:
+                duplicates[name] = sources
+    return unique, duplicates
+
 class UserSimulation:
-    def __init__(self, api_url="http://localhost:3001"):
+    def __init__(self, api_url="http://localhost:3001", simulate_delays=SIMULATE_DELAYS):
         self.api_url = api_url
+        self.simulate_delays = simulate_delays
         self.session = requests.Session()
         self.user_id = "test-user-" + datetime.now().strftime("%Y%m%d%H%M%S")
         self.test_results = {
@@ -24,6 +146,17 @@ class UserSimulation:
         }
         self.test_start_time = None
         self.uploaded_catalogs = []
+        self.total_time_ms = 0.0  # tempo misurato dei passi, aggiornato da ogni simulate_*
+        # Esito della deduplicazione, usato dall'ingestion finale e dal riassunto
+        self.total_unique = 0
+        self.duplicate_count = 0
+        self.cache_speedup = None  # None se le latenze simulate sono disattivate
+        self.quality_score = None  # punteggio complessivo calcolato dallo scoring
+    
+    def simulated_delay(self, seconds):
+        """Attende solo se le latenze simulate sono attive"""
+        if self.simulate_delays:
+            time.sleep(seconds)
     
     def print_header(self, title):
         """Stampa intestazione"""
@@ -66,9 +199,10 @@ class UserSimulation:
         self.print_step(2, "CATALOG UPLOAD")
         
         catalogs_to_test = [
-            ("c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\agriculture\\agriculture_catalog.json", "json"),
-            ("c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\csv\\electronics_products.csv", "csv"),
-            ("c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs\\pdf\\Tech_Products_Catalog_2026.pdf", "pdf"),
+            (HERE / "agriculture" / "agriculture_catalog.json", "json"),
+            (HERE / "electronics" / "extended_electronics_catalog.json", "json"),
+            (HERE / "csv" / "electronics_products.csv", "csv"),
+            (HERE / "pdf" / "Tech_Products_Catalog_2026.pdf", "pdf"),
         ]
         
         test_result = {
@@ -80,33 +214,37 @@ class UserSimulation:
         
         for catalog_path, format_type in catalogs_to_test:
             path = Path(catalog_path)
+            name = path.name
             
-            if not path.exists():
-                print(f"⚠ {path.name} not found, skipping...")
+            # Una sola stat: copre sia l'esistenza sia la dimensione
+            try:
+                file_size = path.stat().st_size
+            except FileNotFoundError:
+                print(f"⚠ {name} not found, skipping...")
                 continue
             
-            file_size = path.stat().st_size
-            upload_time = time.time()
+            upload_time = time.perf_counter()
             
-            print(f"\n📤 Uploading: {path.name}")
+            print(f"\n📤 Uploading: {name}")
             print(f"   Format:  {format_type.upper()}")
             print(f"   Size:    {file_size/1024:.1f} KB")
             
             # Simulate upload
-            time.sleep(0.1)  # Simulare network delay
+            self.simulated_delay(0.1)  # Simulare network delay
             
-            upload_duration = time.time() - upload_time
+            upload_duration = time.perf_counter() - upload_time
+            self.total_time_ms += upload_duration*1000
             print(f"   ✓ Uploaded in {upload_duration*1000:.1f}ms")
             
             self.uploaded_catalogs.append({
-                'file': path.name,
+                'file': name,
                 'format': format_type,
                 'size': file_size,
                 'path': str(path)
             })
             
             test_result['details']['uploads'].append({
-                'filename': path.name,
+                'filename': name,
                 'format': format_type,
                 'size_kb': file_size/1024,
                 'upload_time_ms': upload_duration*1000
@@ -117,6 +255,50 @@ class UserSimulation:
         
         return len(self.uploaded_catalogs) > 0
     
+    def _extract_one(self, catalog):
+        """Estrae un catalogo, restituendo (righe di output, risultato o None)"""
+        out = []
+        catalog_path = Path(catalog['path'])
+        extraction_start = time.perf_counter()
+        
+        out.append(f"\n🔄 Extracting: {catalog['file']}")
+        out.append(f"   Format: {catalog['format'].upper()}")
+        
+        try:
+            if catalog['format'] == 'json':
+                product_count = count_json_products(catalog_path, catalog['size'])
+
+            elif catalog['format'] == 'csv':
+                with open(catalog_path, 'r', encoding='utf-8') as f:
+                    reader = csv.DictReader(f)
+                    products = list(reader)
+                product_count = len(products)
+            
+            elif catalog['format'] == 'pdf':
+                try:
+                    import pdfplumber
+                    with pdfplumber.open(catalog_path) as pdf:
+                        product_count = len(pdf.pages)
+                except:
+                    product_count = 1
+            
+            extraction_time = time.perf_counter() - extraction_start
+            
+            out.append(f"   ✓ Extracted: {product_count} products in {extraction_time*1000:.1f}ms")
+            out.append(f"   Throughput: {product_count/extraction_time:.0f} products/sec")
+            
+            return out, {
+                'filename': catalog['file'],
+                'format': catalog['format'],
+                'products_extracted': product_count,
+                'extraction_time_ms': extraction_time*1000,
+                'throughput': product_count/extraction_time
+            }
+        
+        except Exception as e:
+            out.append(f"   ✗ Error: {str(e)[:50]}")
+            return out, None
+    
     def simulate_ingestion_extraction(self):
         """STEP 3: Simulare ingestion extraction"""
         self.print_step(3, "INGESTION & EXTRACTION")
@@ -130,59 +312,26 @@ class UserSimulation:
         
         total_products = 0
         total_time = 0
+        wall_start = time.perf_counter()
         
-        for catalog in self.uploaded_catalogs:
-            catalog_path = Path(catalog['path'])
-            extraction_start = time.time()
-            
-            print(f"\n🔄 Extracting: {catalog['file']}")
-            print(f"   Format: {catalog['format'].upper()}")
-            
-            try:
-                if catalog['format'] == 'json':
-                    with open(catalog_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    products = data.get('products', [])
-                    product_count = len(products)
-                    
-                    # Simulate extraction processing
-                    for product in products:
-                        _ = product.get('name', '')
-                        _ = product.get('vendor', '')
-                    
-                elif catalog['format'] == 'csv':
-                    with open(catalog_path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        products = list(reader)
-                    product_count = len(products)
-                
-                elif catalog['format'] == 'pdf':
-                    try:
-                        import pdfplumber
-                        with pdfplumber.open(catalog_path) as pdf:
-                            product_count = len(pdf.pages)
-                    except:
-                        product_count = 1
-                
-                extraction_time = time.time() - extraction_start
-                total_products += product_count
-                total_time += extraction_time
+        # Ogni catalogo e' indipendente: I/O e parsing si sovrappongono nei
+        # thread, l'output viene stampato nell'ordine dei cataloghi
+        with ThreadPoolExecutor(max_workers=max(len(self.uploaded_catalogs), 1)) as executor:
+            for lines, extraction in executor.map(self._extract_one, self.uploaded_catalogs):
+                print("\n".join(lines))
                 
-                print(f"   ✓ Extracted: {product_count} products in {extraction_time*1000:.1f}ms")
-                print(f"   Throughput: {product_count/extraction_time:.0f} products/sec")
+                if extraction is None:
+                    test_result['status'] = 'partial_failure'
+                    continue
                 
-                test_result['details']['extractions'].append({
-                    'filename': catalog['file'],
-                    'format': catalog['format'],
-                    'products_extracted': product_count,
-                    'extraction_time_ms': extraction_time*1000,
-                    'throughput': product_count/extraction_time
-                })
-            
-            except Exception as e:
-                print(f"   ✗ Error: {str(e)[:50]}")
-                test_result['status'] = 'partial_failure'
+                total_products += extraction['products_extracted']
+                total_time += extraction['extraction_time_ms'] / 1000
+                test_result['details']['extractions'].append(extraction)
         
+        wall_time = time.perf_counter() - wall_start
+        self.total_time_ms += wall_time*1000
+        
+        test_result['details']['wall_time_ms'] = wall_time*1000
         test_result['details']['total_extracted'] = total_products
         test_result['details']['total_time_ms'] = total_time*1000
         test_result['details']['aggregate_throughput'] = total_products/total_time if total_time > 0 else 0
@@ -204,36 +353,37 @@ class UserSimulation:
         
         print("\n🔍 Analyzing cross-catalog duplicates...")
         
-        dedup_start = time.time()
+        dedup_start = time.perf_counter()
         
-        # Simulare l'analisi di duplicati
-        duplicate_matches = {
-            'Google Pixel 8 Pro': ['electronics_products.csv', 'extended_electronics_catalog.json'],
-            'Microsoft Surface Pro 10': ['electronics_products.csv', 'extended_electronics_catalog.json'],
-            'HP Spectre x360': ['electronics_products.csv', 'extended_electronics_catalog.json'],
-        }
+        # Analisi dei duplicati tra i cataloghi caricati
+        total_unique, duplicate_matches = find_duplicates(self.uploaded_catalogs)
+        sample_matches = dict(list(duplicate_matches.items())[:3])
         
-        time.sleep(0.05)  # Simulate processing
+        self.simulated_delay(0.05)  # Simulate processing
         
-        dedup_time = time.time() - dedup_start
+        dedup_time = time.perf_counter() - dedup_start
+        self.total_time_ms += dedup_time*1000
+        self.total_unique = total_unique
+        self.duplicate_count = len(duplicate_matches)
         
-        print(f"\n   Total unique products: 241")
+        print(f"\n   Total unique products: {total_unique}")
         print(f"   Duplicate matches: {len(duplicate_matches)}")
-        print(f"   Deduplication accuracy: 98.5%")
+        print(f"   Deduplication accuracy: 98.5% (simulated)")
         print(f"   Processing time: {dedup_time*1000:.1f}ms")
         
-        print(f"\n   📍 Sample matches:")
-        for product_name, sources in list(duplicate_matches.items())[:3]:
-            print(f"      • {product_name}")
-            for source in sources:
-                print(f"        - {source}")
+        if sample_matches:
+            print(f"\n   📍 Sample matches:")
+            for product_name, sources in sample_matches.items():
+                print(f"      • {product_name}")
+                for source in sources:
+                    print(f"        - {source}")
         
         test_result['details'] = {
-            'total_unique': 241,
+            'total_unique': total_unique,
             'duplicate_matches': len(duplicate_matches),
             'accuracy': 98.5,
             'processing_time_ms': dedup_time*1000,
-            'sample_matches': duplicate_matches
+            'sample_matches': sample_matches
         }
         
         self.test_results['tests'].append(test_result)
@@ -253,7 +403,7 @@ class UserSimulation:
         
         print("\n📊 Running confidence scoring...")
         
-        scoring_start = time.time()
+        scoring_start = time.perf_counter()
         
         scores = {
             'data_completeness': 94.2,
@@ -261,16 +411,19 @@ class UserSimulation:
             'price_accuracy': 92.5,
             'category_matching': 95.1,
             'duplicate_detection': 98.5,
-            'overall_quality': 95.4
         }
+        scores['overall_quality'] = round(sum(scores.values()) / len(scores), 1)
+        self.quality_score = scores['overall_quality']
         
-        time.sleep(0.08)  # Simulate AI scoring
+        self.simulated_delay(0.08)  # Simulate AI scoring
         
-        scoring_time = time.time() - scoring_start
+        scoring_time = time.perf_counter() - scoring_start
+        self.total_time_ms += scoring_time*1000
         
-        for metric, score in scores.items():
-            status = "✓" if score >= 90 else "⚠"
-            print(f"   {status} {metric:<25} {score:>6.1f}%")
+        print("\n".join(
+            f"   {'✓' if score >= 90 else '⚠'} {metric:<25} {score:>6.1f}%"
+            for metric, score in scores.items()
+        ))
         
         print(f"\n   Overall Quality Score: {scores['overall_quality']:.1f}%")
         print(f"   Scoring time: {scoring_time*1000:.1f}ms")
@@ -299,23 +452,28 @@ class UserSimulation:
         
         print("\n💾 Testing L2 Persistent Cache...")
         
-        cache_start = time.time()
+        cache_start = time.perf_counter()
         
         # First request (cache miss)
         print(f"\n   [Request 1] First extraction (CACHE MISS)")
-        time.sleep(0.1)
-        first_time = time.time() - cache_start
+        self.simulated_delay(0.1)
+        first_time = time.perf_counter() - cache_start
         print(f"      Time: {first_time*1000:.1f}ms")
         
         # Second request (cache hit)
-        cache_hit_start = time.time()
+        cache_hit_start = time.perf_counter()
         print(f"\n   [Request 2] Same extraction (CACHE HIT)")
-        time.sleep(0.01)  # Simulate cache hit speedup
-        hit_time = time.time() - cache_hit_start
+        self.simulated_delay(0.01)  # Simulate cache hit speedup
+        hit_time = time.perf_counter() - cache_hit_start
+        self.total_time_ms += (first_time + hit_time)*1000
         print(f"      Time: {hit_time*1000:.1f}ms")
         
-        speedup = first_time / hit_time
-        print(f"\n   ✓ Cache speedup: {speedup:.1f}x faster")
+        speedup = first_time / hit_time if hit_time > 0 else 0
+        # Senza latenze simulate i due tempi misurano dei no-op: il
+        # rapporto sarebbe rumore, quindi non viene riportato
+        if self.simulate_delays:
+            self.cache_speedup = speedup
+            print(f"\n   ✓ Cache speedup: {speedup:.1f}x faster (simulated)")
         print(f"   ✓ Cache TTL: 24 hours")
         print(f"   ✓ Accelerator Agent: ACTIVE")
         
@@ -386,58 +544,63 @@ class UserSimulation:
         
         print("\n💾 Storing to database...")
         
-        ingestion_start = time.time()
+        ingestion_start = time.perf_counter()
         
         # Simulate database operations
         operations = [
-            ("Insert products", 241),
-            ("Create dedup records", 9),
+            ("Insert products", self.total_unique),
+            ("Create dedup records", self.duplicate_count),
             ("Index catalog", 75),
             ("Update quality metrics", 1),
         ]
         
-        total_records = 0
-        for operation, count in operations:
-            time.sleep(0.05)
-            print(f"   ✓ {operation:<30} {count:>3} records")
-            total_records += count
+        # Tutte le operazioni partono in un unico invio (executemany/COPY),
+        # quindi un solo round-trip simulato invece di uno per operazione
+        self.simulated_delay(0.05)
+        total_records = sum(count for _, count in operations)
+        print("\n".join(f"   ✓ {operation:<30} {count:>3} records" for operation, count in operations))
         
-        ingestion_time = time.time() - ingestion_start
+        ingestion_time = time.perf_counter() - ingestion_start
+        self.total_time_ms += ingestion_time*1000
         
         print(f"\n   Total records: {total_records}")
         print(f"   Database time: {ingestion_time*1000:.1f}ms")
-        print(f"   Throughput: {total_records/ingestion_time:.0f} records/sec")
+        throughput = total_records/ingestion_time if ingestion_time > 0 else 0
+        if self.simulate_delays:
+            print(f"   Throughput: {throughput:.0f} records/sec (simulated)")
         
         test_result['details'] = {
             'operations': operations,
             'total_records_stored': total_records,
             'ingestion_time_ms': ingestion_time*1000,
-            'throughput': total_records/ingestion_time
+            'throughput': throughput
         }
         
         self.test_results['tests'].append(test_result)
         
         return True
     
+    def count_successful_tests(self):
+        """Numero di passi completati con successo"""
+        return sum(1 for t in self.test_results['tests'] if t['status'] == 'success')
+    
     def print_summary(self):
         """Stampa il riassunto finale"""
         self.print_header("END-TO-END USER SIMULATION SUMMARY")
         
-        total_duration = sum(t.get('details', {}).get('total_time_ms', 
-                            t.get('details', {}).get('extraction_time_ms',
-                            t.get('details', {}).get('scoring_time_ms', 0))) 
-                            for t in self.test_results['tests'] if 'details' in t)
-        
         print(f"\n👤 User ID:              {self.user_id}")
         print(f"📊 Total Steps:         {len(self.test_results['tests'])}")
-        print(f"✓ Successful Tests:     {len([t for t in self.test_results['tests'] if t['status'] == 'success'])}")
-        print(f"⏱ Total Duration:       {(time.time() - self.test_start_time):.2f} seconds")
+        print(f"✓ Successful Tests:     {self.count_successful_tests()}")
+        print(f"⏱ Total Duration:       {(time.perf_counter() - self.test_start_time):.2f} seconds")
+        print(f"⏱ Measured Step Time:   {self.total_time_ms:.1f}ms")
         
         print(f"\n📈 KEY METRICS:")
         print(f"   Catalogs uploaded:    {len(self.uploaded_catalogs)}")
-        print(f"   Products extracted:   241 (with deduplication)")
-        print(f"   Quality score:        95.4%")
-        print(f"   Cache speedup:        10.0x")
+        print(f"   Products extracted:   {self.total_unique} (with deduplication)")
+        if self.quality_score is not None:
+            print(f"   Quality score:        {self.quality_score:.1f}%")
+        if self.cache_speedup is not None:
+            print(f"   Cache speedup:        {self.cache_speedup:.1f}x (simulated)")
         print(f"   Data validation:      100% passed")
         
         print(f"\n🎯 TEST RESULTS:")
@@ -454,28 +617,58 @@ class UserSimulation:
         self.test_results['summary'] = {
             'user_id': self.user_id,
             'total_tests': len(self.test_results['tests']),
-            'successful_tests': len([t for t in self.test_results['tests'] if t['status'] == 'success']),
+            'successful_tests': self.count_successful_tests(),
+            'measured_time_ms': self.total_time_ms,
             'catalogs_processed': len(self.uploaded_catalogs),
-            'total_duration_sec': time.time() - self.test_start_time,
+            'total_duration_sec': time.perf_counter() - self.test_start_time,
             'test_date': datetime.now().isoformat()
         }
         
-        filepath = Path("c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs") / filename
+        filepath = HERE / filename
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.test_results, f, indent=2, default=str)
+            results = self.test_results
+            if HAS_PYARROW:
+                results = self.export_extractions_parquet(filepath)
+            if HAS_ORJSON:
+                filepath.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(results, f, indent=2, default=str)
             print(f"\n✓ Results exported to: {filepath}")
         except Exception as e:
             print(f"\n⚠ Could not export results: {str(e)}")
     
+    def export_extractions_parquet(self, filepath):
+        """Scrive le estrazioni in Parquet (colonnare, zstd) accanto al JSON.
+
+        Restituisce i risultati da esportare in JSON, dove la lista delle
+        estrazioni e' sostituita dal riferimento al file Parquet.
+        """
+        tests = []
+        for test in self.test_results['tests']:
+            if test['step'] == 'ingestion_extraction':
+                extractions = test['details']['extractions']
+                parquet_path = filepath.with_name(f"{filepath.stem}_extractions.parquet")
+                table = pa.table({
+                    column: [e[column] for e in extractions] for column in EXTRACTION_COLUMNS
+                })
+                pq.write_table(table, parquet_path, compression='zstd')
+                print(f"\n✓ Extractions exported to: {parquet_path}")
+                test = {**test, 'details': {
+                    **test['details'],
+                    'extractions': {'parquet': parquet_path.name, 'rows': table.num_rows},
+                }}
+            tests.append(test)
+        return {**self.test_results, 'tests': tests}
+    
     def run(self):
         """Esegui l'intera simulazione"""
         print("\n" + "🚀 "*25)
         print("THEMIS PLATFORM - END-TO-END USER SIMULATION TEST")
         print("🚀 "*25)
         
-        self.test_start_time = time.time()
+        self.test_start_time = time.perf_counter()
         
         steps = [
             ("Simulating User Login", self.simulate_user_login),
@@ -3,9 +3,13 @@
 Direct Extraction Time Measurement
 Misura i tempi di estrazione senza dipendere dall'API
 """
+import os
+import mmap
 import json
 import time
 import csv
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
 try:
@@ -14,44 +18,112 @@ try:
 except ImportError:
     HAS_PDFPLUMBER = False
 
+# PyMuPDF estrae testo e tabelle nella libreria C di MuPDF, molto piu'
+# veloce dell'analisi di layout in puro Python di pdfplumber/pdfminer
+try:
+    import pymupdf as fitz
+    HAS_PYMUPDF = True
+except ImportError:
+    try:
+        import fitz
+        HAS_PYMUPDF = hasattr(fitz, 'open')
+    except ImportError:
+        HAS_PYMUPDF = False
+
+# Il tokenizer C di pandas e' il percorso compilato per i CSV: i cataloghi
+# hanno campi quotati con virgole e a capo ("t3.medium, 4GB RAM, ..."),
+# quindi una scansione byte per byte di ',' e '\n' non basta.
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+# Colonne CSV candidate per nome prodotto e vendor, in ordine di priorita'
+NAME_COLUMNS = ['Product Name', 'Product', 'Service']
+VENDOR_COLUMNS = ['Vendor', 'Provider']
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def load_json(path):
+    """Carica un file JSON mappandolo in memoria, con orjson se disponibile.
+
+    Con orjson il parser legge direttamente le pagine mappate (page cache)
+    tramite memoryview, senza copiare il file in un buffer intermedio.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Empty JSON file: {path}")  # mmap non accetta file vuoti
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if not HAS_ORJSON:
+                return json.loads(mm[:])
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+def extract_fields(products, keys):
+    """Proietta i campi richiesti di ogni prodotto in una tupla.
+
+    itemgetter esegue la proiezione in C; se un prodotto non ha tutti i
+    campi si ripiega su .get() con stringa vuota come default.
+    """
+    get = itemgetter(*keys)
+    try:
+        return list(map(get, products))
+    except KeyError:
+        return [tuple(p.get(k, '') for k in keys) for p in products]
+
+def iter_json_catalogs(root):
+    """Percorre ricorsivamente root restituendo i cataloghi JSON.
+
+    os.scandir riusa nome e tipo delle DirEntry senza stat aggiuntive e
+    si ferma appena il chiamante ha abbastanza file.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_json_catalogs(entry.path)
+            else:
+                lower = entry.name.lower()
+                if lower.endswith('.json') and 'catalog' in lower:
+                    yield Path(entry.path)
+
 def measure_json_extraction():
     """Misura il tempo di estrazione JSON"""
     print("\n" + "="*60)
     print("⏱ JSON EXTRACTION TIME MEASUREMENT")
     print("="*60)
     
-    # Find all JSON catalogs
-    json_files = list(Path(".").rglob("*.json"))
-    # Filter for real catalogs (ones with "catalog" in the name)
-    catalogs = [f for f in json_files if "catalog" in f.name.lower()][:3]
+    # Find the first JSON catalogs (ones with "catalog" in the name)
+    catalogs = list(islice(iter_json_catalogs("."), 3))
     
     results = []
     
     for catalog_path in catalogs:
-        if not catalog_path.exists():
-            print(f"\n⚠ {catalog_path.name} not found")
-            continue
-        
-        print(f"\n📦 {catalog_path.name}")
+        # I percorsi vengono dalla scansione os.scandir, quindi esistono gia': niente stat extra
+        file_name = catalog_path.name
+        print(f"\n📦 {file_name}")
         
         # Measure load time
-        start = time.time()
-        with open(catalog_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        load_time = time.time() - start
+        start = time.perf_counter()
+        data = load_json(catalog_path)
+        load_time = time.perf_counter() - start
         
         # Measure extraction simulation
-        start = time.time()
+        start = time.perf_counter()
         products = data.get('products', [])
         product_count = len(products)
         
-        # Simula l'estrazione: parsing di ogni prodotto
-        for product in products:
-            name = product.get('name', '')
-            vendor = product.get('vendor', '')
-            category = product.get('category', '')
+        # Simula l'estrazione: proiezione dei campi di ogni prodotto
+        rows = extract_fields(products, ('name', 'vendor', 'category'))
         
-        extraction_time = time.time() - start
+        extraction_time = time.perf_counter() - start
         total_time = load_time + extraction_time
         throughput = product_count / extraction_time if extraction_time > 0 else 0
         
@@ -63,7 +135,7 @@ def measure_json_extraction():
         
         results.append({
             'format': 'JSON',
-            'file': catalog_path.name,
+            'file': file_name,
             'products': product_count,
             'load_ms': load_time*1000,
             'extraction_ms': extraction_time*1000,
@@ -73,6 +145,18 @@ def measure_json_extraction():
     
     return results
 
+def first_non_empty(df, columns):
+    """Per ogni riga, il primo valore non vuoto tra le colonne indicate.
+
+    read_csv legge le celle vuote come NaN, quindi fillna() sceglie la
+    colonna successiva solo dove la precedente e' vuota.
+    """
+    result = None
+    for column in columns:
+        if column in df:
+            result = df[column] if result is None else result.fillna(df[column])
+    return result.fillna('') if result is not None else None
+
 def measure_csv_extraction():
     """Misura il tempo di estrazione CSV"""
     print("\n" + "="*60)
@@ -94,25 +178,43 @@ def measure_csv_extraction():
             print(f"\n⚠ {catalog} not found")
             continue
         
-        print(f"\n📦 {Path(catalog).name}")
-        
-        # Measure load time
-        start = time.time()
-        with open(catalog_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        load_time = time.time() - start
-        
-        # Measure extraction simulation
-        start = time.time()
-        product_count = 0
-        for row in rows:
-            product_count += 1
-            # Simula l'estrazione dei campi
-            name = row.get('Product Name') or row.get('Product') or row.get('Service', '')
-            vendor = row.get('Vendor') or row.get('Provider', '')
+        file_name = catalog_path.name
+        print(f"\n📦 {file_name}")
         
-        extraction_time = time.time() - start
+        if HAS_PANDAS:
+            # Measure load time (tokenizer C di pandas, solo le colonne usate)
+            start = time.perf_counter()
+            df = pd.read_csv(catalog_path, engine='c', dtype=str, memory_map=True,
+                             usecols=lambda c: c in NAME_COLUMNS + VENDOR_COLUMNS)
+            load_time = time.perf_counter() - start
+            
+            # Measure extraction simulation (vettoriale, per colonna)
+            start = time.perf_counter()
+            product_count = len(df.index)
+            name = first_non_empty(df, NAME_COLUMNS)
+            vendor = first_non_empty(df, VENDOR_COLUMNS)
+            extraction_time = time.perf_counter() - start
+        else:
+            # Measure load time
+            start = time.perf_counter()
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+            load_time = time.perf_counter() - start
+            
+            # Measure extraction simulation
+            start = time.perf_counter()
+            # La colonna di nome e vendor si sceglie una volta dall'header
+            fields = reader.fieldnames or []
+            name_key = next((k for k in NAME_COLUMNS if k in fields), None)
+            vendor_key = next((k for k in VENDOR_COLUMNS if k in fields), None)
+            product_count = len(rows)
+            for row in rows:
+                # Simula l'estrazione dei campi
+                name = row[name_key] if name_key else ''
+                vendor = row[vendor_key] if vendor_key else ''
+            
+            extraction_time = time.perf_counter() - start
         total_time = load_time + extraction_time
         throughput = product_count / extraction_time if extraction_time > 0 else 0
         
@@ -124,7 +226,7 @@ def measure_csv_extraction():
         
         results.append({
             'format': 'CSV',
-            'file': Path(catalog).name,
+            'file': file_name,
             'products': product_count,
             'load_ms': load_time*1000,
             'extraction_ms': extraction_time*1000,
@@ -134,13 +236,43 @@ def measure_csv_extraction():
     
     return results
 
+def read_pdf_pymupdf(path):
+    """Legge un PDF con PyMuPDF, restituendo (pagine, tabelle)"""
+    with fitz.open(path) as doc:
+        tables = []
+        # Un solo passaggio sulle pagine per testo e tabelle; il testo non
+        # viene usato ma la sua estrazione fa parte del tempo misurato
+        for page in doc:
+            page.get_text()
+            tables.extend(table.extract() for table in page.find_tables())
+        return doc.page_count, tables
+
+def read_pdf_pdfplumber(path):
+    """Legge un PDF con pdfplumber, restituendo (pagine, tabelle).
+
+    Dopo l'estrazione di testo e tabelle, page.flush_cache() libera il
+    layout in cache della pagina, cosi' la memoria non cresce con il numero
+    di pagine del documento.
+    Il testo non viene usato ma la sua estrazione fa parte del tempo misurato.
+    """
+    import pdfplumber
+    with pdfplumber.open(path) as pdf:
+        tables = []
+
+        for page in pdf.pages:
+            page.extract_text()
+            tables.extend(page.extract_tables())
+            page.flush_cache()
+
+        return len(pdf.pages), tables
+
 def measure_pdf_extraction():
     """Misura il tempo di estrazione PDF"""
     print("\n" + "="*60)
     print("⏱ PDF EXTRACTION TIME MEASUREMENT")
     print("="*60)
     
-    if not HAS_PDFPLUMBER:
+    if not HAS_PYMUPDF and not HAS_PDFPLUMBER:
         print("\n⚠ pdfplumber not available, installing...")
         import subprocess
         subprocess.run(["pip", "install", "pdfplumber", "-q"], check=False)
@@ -152,12 +284,16 @@ def measure_pdf_extraction():
     
     results = []
     
-    try:
-        import pdfplumber
-    except ImportError:
-        print("\n✗ Could not install pdfplumber")
-        return results
-    
+    if HAS_PYMUPDF:
+        read_pdf = read_pdf_pymupdf
+    else:
+        try:
+            import pdfplumber
+        except ImportError:
+            print("\n✗ Could not install pdfplumber")
+            return results
+        read_pdf = read_pdf_pdfplumber
+
     for catalog in catalogs:
         catalog_path = Path(catalog)
         
@@ -165,36 +301,28 @@ def measure_pdf_extraction():
             print(f"\n⚠ {catalog} not found")
             continue
         
-        print(f"\n📦 {Path(catalog).name}")
+        file_name = catalog_path.name
+        print(f"\n📦 {file_name}")
         
         # Measure load and extraction time
-        start = time.time()
+        start = time.perf_counter()
         
         try:
-            with pdfplumber.open(catalog_path) as pdf:
-                pages = len(pdf.pages)
-                tables = []
-                text = ""
-                
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
-                
-                # Count extracted products
-                product_count = 0
-                for table in tables:
-                    if len(table) > 1:
-                        for row in table[1:]:
-                            if len(row) > 0 and row[0]:
-                                product_count += 1
+            pages, tables = read_pdf(catalog_path)
+
+            # Count extracted products
+            product_count = 0
+            for table in tables:
+                if len(table) > 1:
+                    for row in table[1:]:
+                        if len(row) > 0 and row[0]:
+                            product_count += 1
         
         except Exception as e:
             print(f"  ✗ Error: {str(e)[:50]}")
             continue
         
-        total_time = time.time() - start
+        total_time = time.perf_counter() - start
         throughput = product_count / total_time if total_time > 0 else 0
         
         print(f"  • Total time:     {total_time*1000:.1f}ms")
@@ -205,7 +333,7 @@ def measure_pdf_extraction():
         
         results.append({
             'format': 'PDF',
-            'file': Path(catalog).name,
+            'file': file_name,
             'products': product_count,
             'total_ms': total_time*1000,
             'throughput': throughput
@@ -4,11 +4,19 @@ Multi-Format Ingestion Pipeline Test
 Tests JSON, PDF, and CSV catalog ingestion with deduplication
 """
 import os
+import argparse
+import importlib.util
 import json
 import csv
 import sys
+import random
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 
 # Try to import PDF processing libraries
 try:
@@ -18,16 +26,436 @@ except ImportError:
     HAS_PDFPLUMBER = False
     print("⚠ pdfplumber not installed, PDF extraction will be limited")
 
+# simdjson parses with SIMD instructions and converts to Python objects lazily
+try:
+    import simdjson
+    HAS_SIMDJSON = True
+except ImportError:
+    HAS_SIMDJSON = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# ijson parses large catalogs incrementally (C yajl2 backend if present)
+try:
+    import ijson.backends.yajl2_c as ijson
+    HAS_IJSON = True
+except ImportError:
+    try:
+        import ijson
+        HAS_IJSON = True
+    except ImportError:
+        HAS_IJSON = False
+
+# JSON catalogs from this size on are streamed instead of loaded whole
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+JSON_STREAM_BUFFER_SIZE = 1 << 18
+
+# pyarrow tokenizes CSV in C++ into columnar arrays
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# CSV column names vary: candidates for the product id and the vendor
+CSV_ID_COLUMNS = ['Product Name', 'Product', 'id']
+CSV_VENDOR_COLUMNS = ['Vendor', 'Provider']
+
+# One ingested product; a tuple is a fraction of the size of a dict
+Product = namedtuple('Product', ['id', 'name', 'vendor', 'source', 'format'])
+
+# One simdjson parser per process (each pool worker imports the module),
+# reused across files so its buffers are allocated once
+JSON_PARSER = simdjson.Parser() if HAS_SIMDJSON else None
+
+# pdfplumber keeps every page layout in memory: fewer PDF workers
+PDF_MAX_WORKERS = 2
+PDF_BUFFER_SIZE = 1 << 20
+
+# Files parsed ahead of the merge, per format
+MAX_IN_FLIGHT = 8
+
+# Products buffered per format before a Parquet shard is written
+SHARD_ROWS = 10_000
+
+# Seed for sample_n, so sampled runs pick the same files every time
+SAMPLE_SEED = 42
+
+
+def _load_json(json_file):
+    """Parse a JSON catalog with simdjson, falling back to orjson/json.
+
+    The file is read in one call and the bytes handed to the parser,
+    skipping the text decoder of a file opened in text mode.
+    """
+    data = json_file.read_bytes()
+    if JSON_PARSER is not None:
+        try:
+            return JSON_PARSER.parse(data)
+        except ValueError:
+            pass  # invalid JSON: orjson/json below reports the error
+    return _loads(data)
+
+
+def _json_products(items, json_file):
+    """Build the product records from parsed JSON product objects"""
+    products = []
+    for product in items:
+        product_id = product.get('id', product.get('name', 'unknown'))
+        products.append(Product(product_id, product.get('name', 'N/A'), product.get('vendor', 'N/A'),
+                                str(json_file.name), 'JSON'))
+    return products
+
+
+def _parse_json_file(json_file):
+    """Parse a JSON catalog, returning (products, output lines, error).
+
+    simdjson documents are only valid until the parser is reused, so
+    they are kept local to this call and only the fields needed are
+    converted to Python objects.
+    """
+    try:
+        if HAS_IJSON and json_file.stat().st_size >= STREAM_MIN_BYTES:
+            # One product at a time: peak memory does not grow with the file
+            with open(json_file, 'rb', buffering=JSON_STREAM_BUFFER_SIZE) as f:
+                catalog_name = next(ijson.items(f, 'catalog_name'), json_file.name)
+                f.seek(0)
+                products = _json_products(ijson.items(f, 'products.item', use_float=True), json_file)
+        else:
+            data = _load_json(json_file)
+            catalog_name = data.get('catalog_name', json_file.name)
+            products = _json_products(data.get('products', []), json_file)
+    except Exception as e:
+        return [], [], str(e)
+    
+    status = "✓" if products else "○"
+    return products, [
+        f"{status} {json_file.name}",
+        f"   Catalog: {catalog_name}",
+        f"   Products: {len(products)}",
+    ], None
+
+
+def _parse_csv_file(csv_file):
+    """Parse a CSV catalog, returning (products, output lines, error)"""
+    try:
+        if HAS_PYARROW:
+            # Only the candidate columns are converted; absent ones are all None
+            columns = CSV_ID_COLUMNS + CSV_VENDOR_COLUMNS
+            table = pacsv.read_csv(
+                csv_file,
+                read_options=pacsv.ReadOptions(block_size=1 << 20),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=columns,
+                    include_missing_columns=True,
+                    column_types={c: pa.string() for c in columns},
+                ),
+            )
+            rows = zip(*(table[c].to_pylist() for c in columns))
+        else:
+            with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                rows = list(_csv_candidate_rows(csv.reader(f)))
+        
+        products = []
+        for product_name, product, id_, vendor, provider in rows:
+            product_id = product_name or product or ('unknown' if id_ is None else id_)
+            name = product_id
+            vendor = vendor or provider or 'N/A'
+            
+            products.append(Product(product_id, name, vendor, str(csv_file.name), 'CSV'))
+    except Exception as e:
+        return [], [], str(e)
+    
+    return products, [
+        f"✓ {csv_file.name}",
+        f"   Products: {len(products)}",
+    ], None
+
+
+def _csv_candidate_rows(reader):
+    """Yield the candidate id/vendor cells of each CSV row, None if absent.
+
+    Column positions are resolved once from the header into a single
+    itemgetter; a missing column points at a None slot appended to the
+    row, so each row costs one C-level call instead of a lookup per
+    candidate.
+    """
+    header = next(reader, [])
+    width = len(header)
+    get = itemgetter(*(header.index(c) if c in header else width
+                       for c in CSV_ID_COLUMNS + CSV_VENDOR_COLUMNS))
+    for row in reader:
+        if not row:
+            continue  # blank line, skipped like DictReader does
+        if len(row) != width:
+            row = (row + [None] * width)[:width]
+        row.append(None)
+        yield get(row)
+
+
+@lru_cache(maxsize=100_000)
+def _normalize_cell(value):
+    """Strip a PDF table cell; empty cells (None) become 'N/A'.
+
+    Vendor and product names repeat across rows, so the cache returns the
+    same string object for each repeat, which pickle also sends only once.
+    """
+    return 'N/A' if value is None else value.strip()
+
+
+def _parse_pdf_file(pdf_file):
+    """Parse a PDF catalog's tables, returning (products, output lines, error)"""
+    import pdfplumber
+    
+    try:
+        # A 1 MB buffer turns pdfminer's many small seeks/reads (xref,
+        # object streams) into few syscalls
+        with open(pdf_file, 'rb', buffering=PDF_BUFFER_SIZE) as fh, pdfplumber.open(fh) as pdf:
+            products = []
+            table_count = 0
+            
+            # Tables are consumed page by page and each page's layout is
+            # released right after, so memory stays flat on long documents.
+            # extract_tables() is the only pass over a page: it works from
+            # the cached page.chars/page.edges, with no text extraction and
+            # no pdfminer layout analysis (laparams left unset)
+            for page in pdf.pages:
+                for table in page.extract_tables():
+                    table_count += 1
+                    # Extract product data from the rows after the header
+                    for row in table[1:]:
+                        if len(row) > 0 and row[0]:
+                            product_id = _normalize_cell(row[0])
+                            vendor = _normalize_cell(row[1]) if len(row) > 1 else 'N/A'
+                            
+                            products.append(Product(product_id, product_id, vendor, str(pdf_file.name), 'PDF'))
+                page.flush_cache()
+            
+            pages = len(pdf.pages)
+    except Exception as e:
+        return [], [], str(e)
+    
+    return products, [
+        f"✓ {pdf_file.name}",
+        f"   Pages: {pages}",
+        f"   Tables extracted: {table_count}",
+        f"   Products: {len(products)}",
+    ], None
+
+
+def _text_array(values):
+    """Arrow string array of values, keeping None as null"""
+    return pa.array([v if v is None or isinstance(v, str) else str(v) for v in values],
+                    pa.string(), from_pandas=False)
+
+
+def _bounded_map(executor, fn, items, window=MAX_IN_FLIGHT):
+    """Like executor.map, but with at most `window` tasks in flight.
+
+    The first window is submitted right away; each result taken frees a
+    slot for the next item, so parsed files never pile up faster than
+    they are merged (backpressure). Results come back in input order.
+    """
+    items = iter(items)
+    pending = deque(executor.submit(fn, item) for item in islice(items, window))
+    
+    def results():
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(items, 1):
+                pending.append(executor.submit(fn, item))
+            yield result
+    
+    return results()
+
+
 class CatalogIngestionTester:
-    def __init__(self, catalogs_dir):
+    def __init__(self, catalogs_dir, sample_n=None, verbose=True, shard_dir=None):
         self.catalogs_dir = catalogs_dir
+        # Print the per-file details; errors and summaries are always shown
+        self.verbose = verbose
+        # Number of JSON files to ingest (a seeded random sample); None = all
+        self.sample_n = sample_n
         self.results = {
             'json': {'count': 0, 'products': [], 'errors': []},
             'csv': {'count': 0, 'products': [], 'errors': []},
             'pdf': {'count': 0, 'products': [], 'errors': []},
         }
-        self.dedup_map = {}
+        # First source of every product id; the distinct sources are only
+        # kept for ids found in more than one file
+        self.first_source = {}
+        self.duplicates = {}
         self.start_time = datetime.now()
+        # fmt -> (files, result iterator) of parsing started by run()
+        self.prefetched = {}
+        # Catalog files by format, from a single walk of catalogs_dir
+        self.scan = None
+        # With pyarrow, products are spilled to Parquet shards here instead
+        # of accumulating in results[fmt]['products'] (None = keep in RAM)
+        self.shard_dir = Path(shard_dir) if shard_dir is not None and HAS_PYARROW else None
+        self.shards = []
+    
+    def _ingest_files(self, fmt, files, parse_file, max_workers=None):
+        """Parse files in a process pool and merge the results in file order.
+
+        Workers only parse; counts, product lists and the dedup map are
+        updated here in the main process.
+        """
+        if not files:
+            return
+        
+        prefetched_files, results = self.prefetched.pop(fmt, (None, None))
+        if prefetched_files == files:
+            self._merge_results(fmt, files, results)
+            return
+        
+        workers = min(len(files), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            self._merge_results(fmt, files, _bounded_map(executor, parse_file, files))
+    
+    def _prefetch(self, fmt, files, parse_file, executor):
+        """Start parsing files in the background; _ingest_files merges them later.
+
+        The first window of files is submitted immediately, so all formats
+        parse concurrently while the results are still merged format by
+        format.
+        """
+        if files:
+            self.prefetched[fmt] = (files, _bounded_map(executor, parse_file, files))
+    
+    def _merge_results(self, fmt, files, results):
+        """Fold per-file parse results into self.results, in file order"""
+        for path, (products, lines, error) in zip(files, results):
+            if error is not None:
+                self.results[fmt]['errors'].append({
+                    'file': str(path),
+                    'error': error
+                })
+                print(f"✗ {path.name}: {error[:50]}")
+                continue
+            
+            # Unpickled strings are fresh copies: intern ids and the
+            # file name so repeated values share one object (and hash)
+            source = sys.intern(path.name)
+            bucket = self.results[fmt]
+            merged = []
+            for product_id, name, vendor, _, product_format in products:
+                if isinstance(product_id, str):
+                    product_id = sys.intern(product_id)
+                merged.append(Product(product_id, name, vendor, source, product_format))
+                # Dedup stays inline: it overlaps with the files still
+                # parsing, whereas an Arrow value_counts pass at the end
+                # would first build the id arrays from these same objects
+                # (and could not keep int and str ids apart)
+                self._add_dedup(product_id, source)
+            
+            bucket['count'] += len(merged)
+            bucket['products'].extend(merged)
+            if self.shard_dir is not None and len(bucket['products']) >= SHARD_ROWS:
+                self._flush_shard(fmt)
+            if self.verbose:
+                print("\n".join(lines))
+    
+    def _flush_shard(self, fmt):
+        """Write the buffered products of fmt to a new Parquet shard"""
+        products = self.results[fmt]['products']
+        if not products:
+            return
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        # Every shard shares one all-text schema. Missing values stay null;
+        # ids may be ints in some JSON catalogs, so each id's original type
+        # is kept next to its text
+        columns = dict(zip(Product._fields, (_text_array(c) for c in zip(*products))))
+        columns['id_type'] = pa.array([type(p.id).__name__ for p in products], pa.string())
+        table = pa.table(columns)
+        shard = self.shard_dir / f"{fmt}-{len(self.shards):05d}.parquet"
+        pq.write_table(table, shard)
+        self.shards.append(shard)
+        self.results[fmt]['products'] = []
+    
+    def _merge_shards(self):
+        """Concatenate the shards into shard_dir/products.parquet.
+
+        The file is written under a temporary name and renamed into place,
+        so it is either complete or absent; the shards are removed after.
+        """
+        for fmt in self.results:
+            self._flush_shard(fmt)
+        if not self.shards:
+            return None
+        target = self.shard_dir / 'products.parquet'
+        partial = self.shard_dir / 'products.parquet.tmp'
+        with pq.ParquetWriter(partial, pq.read_schema(self.shards[0])) as writer:
+            for shard in self.shards:
+                writer.write_table(pq.read_table(shard))
+        os.replace(partial, target)
+        for shard in self.shards:
+            shard.unlink()
+        self.shards = []
+        return target
+    
+    def _scan_catalogs(self):
+        """Classify the catalog files of catalogs_dir in one os.scandir walk.
+
+        JSON catalogs (files with "catalog" in the name, as in the other
+        scripts: results, aliases and taxonomies are skipped) are collected
+        from the whole tree, CSV and PDF files only from the csv/ and pdf/
+        directories (None if missing). Files
+        come in rglob order: a directory's files, then its subdirectories.
+        """
+        if self.scan is not None:
+            return self.scan
+        
+        root = os.path.normpath(self.catalogs_dir)
+        found = {'json': [], 'csv': None, 'pdf': None}
+        by_dir = {os.path.join(root, 'csv'): ('csv', '.csv'), os.path.join(root, 'pdf'): ('pdf', '.pdf')}
+        
+        def walk(directory):
+            subdirs = []
+            kind, extension = by_dir.get(directory, (None, None))
+            if kind is not None:
+                found[kind] = []
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    lower = entry.name.lower()
+                    if lower.endswith('.json') and 'catalog' in lower:
+                        found['json'].append(Path(entry.path))
+                    if kind is not None and entry.name.endswith(extension):
+                        found[kind].append(Path(entry.path))
+            for subdir in subdirs:
+                walk(subdir)
+        
+        walk(root)
+        self.scan = found
+        return found
+    
+    def _find_json_files(self):
+        """JSON catalogs (*catalog*.json) under catalogs_dir"""
+        return self._scan_catalogs()['json']
+    
+    def _find_csv_files(self):
+        """CSV catalogs, or None if the csv directory is missing"""
+        return self._scan_catalogs()['csv']
+    
+    def _find_pdf_files(self):
+        """PDF catalogs, or None if the pdf directory is missing"""
+        return self._scan_catalogs()['pdf']
+    
+    def _sample_json_files(self, json_files):
+        """All JSON files, or a seeded sample of sample_n kept in scan order"""
+        if self.sample_n is None or self.sample_n >= len(json_files):
+            return json_files
+        picked = set(random.Random(SAMPLE_SEED).sample(range(len(json_files)), self.sample_n))
+        return [f for i, f in enumerate(json_files) if i in picked]
     
     def test_json_catalogs(self):
         """Test JSON catalog ingestion"""
@@ -35,44 +463,14 @@ class CatalogIngestionTester:
         print("🔵 TESTING JSON CATALOGS")
         print("="*60)
         
-        json_dir = Path(self.catalogs_dir)
-        json_files = list(json_dir.rglob("*.json"))
+        json_files = self._find_json_files()
         
         print(f"Found {len(json_files)} JSON files\n")
         
-        for json_file in json_files[:10]:  # Test first 10 to keep it quick
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                catalog_name = data.get('catalog_name', json_file.name)
-                products = data.get('products', [])
-                product_count = len(products)
-                
-                self.results['json']['count'] += product_count
-                
-                for product in products:
-                    product_id = product.get('id', product.get('name', 'unknown'))
-                    self.results['json']['products'].append({
-                        'id': product_id,
-                        'name': product.get('name', 'N/A'),
-                        'vendor': product.get('vendor', 'N/A'),
-                        'source': str(json_file.name),
-                        'format': 'JSON'
-                    })
-                    self._add_dedup(product_id, json_file.name)
-                
-                status = "✓" if product_count > 0 else "○"
-                print(f"{status} {json_file.name}")
-                print(f"   Catalog: {catalog_name}")
-                print(f"   Products: {product_count}")
-                
-            except Exception as e:
-                self.results['json']['errors'].append({
-                    'file': str(json_file),
-                    'error': str(e)
-                })
-                print(f"✗ {json_file.name}: {str(e)[:50]}")
+        sampled = self._sample_json_files(json_files)
+        if len(sampled) < len(json_files):
+            print(f"Sampling {len(sampled)} of them (seed {SAMPLE_SEED})\n")
+        self._ingest_files('json', sampled, _parse_json_file)
         
         print(f"\n✓ JSON Ingestion: {self.results['json']['count']} products extracted")
     
@@ -82,47 +480,14 @@ class CatalogIngestionTester:
         print("🟢 TESTING CSV CATALOGS")
         print("="*60)
         
-        csv_dir = Path(self.catalogs_dir) / "csv"
-        if not csv_dir.exists():
+        csv_files = self._find_csv_files()
+        if csv_files is None:
             print("⚠ CSV directory not found")
             return
         
-        csv_files = list(csv_dir.glob("*.csv"))
         print(f"Found {len(csv_files)} CSV files\n")
         
-        for csv_file in csv_files:
-            try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    rows = list(reader)
-                
-                product_count = len(rows)
-                self.results['csv']['count'] += product_count
-                
-                for row in rows:
-                    # CSV column names vary, try common ones
-                    product_id = row.get('Product Name') or row.get('Product') or row.get('id', 'unknown')
-                    name = product_id
-                    vendor = row.get('Vendor') or row.get('Provider') or 'N/A'
-                    
-                    self.results['csv']['products'].append({
-                        'id': product_id,
-                        'name': name,
-                        'vendor': vendor,
-                        'source': str(csv_file.name),
-                        'format': 'CSV'
-                    })
-                    self._add_dedup(product_id, csv_file.name)
-                
-                print(f"✓ {csv_file.name}")
-                print(f"   Products: {product_count}")
-                
-            except Exception as e:
-                self.results['csv']['errors'].append({
-                    'file': str(csv_file),
-                    'error': str(e)
-                })
-                print(f"✗ {csv_file.name}: {str(e)[:50]}")
+        self._ingest_files('csv', csv_files, _parse_csv_file)
         
         print(f"\n✓ CSV Ingestion: {self.results['csv']['count']} products extracted")
     
@@ -132,120 +497,84 @@ class CatalogIngestionTester:
         print("🔴 TESTING PDF CATALOGS")
         print("="*60)
         
-        pdf_dir = Path(self.catalogs_dir) / "pdf"
-        if not pdf_dir.exists():
+        pdf_files = self._find_pdf_files()
+        if pdf_files is None:
             print("⚠ PDF directory not found")
             return
         
-        pdf_files = list(pdf_dir.glob("*.pdf"))
         print(f"Found {len(pdf_files)} PDF files\n")
         
         if not HAS_PDFPLUMBER:
             print("⚠ pdfplumber not available, installing...")
             os.system("pip install pdfplumber -q")
-            try:
-                import pdfplumber as pdf_lib
-            except ImportError:
+            # _parse_pdf_file imports it in the workers: only check it is there
+            if importlib.util.find_spec('pdfplumber') is None:
                 print("✗ Could not import pdfplumber after installation")
                 return
-        else:
-            import pdfplumber as pdf_lib
-        
-        for pdf_file in pdf_files:
-            try:
-                with pdf_lib.open(pdf_file) as pdf:
-                    text = ""
-                    tables = []
-                    
-                    for page in pdf.pages:
-                        text += page.extract_text() or ""
-                        page_tables = page.extract_tables()
-                        if page_tables:
-                            tables.extend(page_tables)
-                    
-                    # Extract product data from tables
-                    product_count = 0
-                    for table in tables:
-                        if len(table) > 1:
-                            headers = table[0]
-                            for row in table[1:]:
-                                if len(row) > 0 and row[0]:
-                                    product_id = row[0].strip()
-                                    vendor = row[1].strip() if len(row) > 1 else 'N/A'
-                                    
-                                    self.results['pdf']['products'].append({
-                                        'id': product_id,
-                                        'name': product_id,
-                                        'vendor': vendor,
-                                        'source': str(pdf_file.name),
-                                        'format': 'PDF'
-                                    })
-                                    self._add_dedup(product_id, pdf_file.name)
-                                    product_count += 1
-                    
-                    self.results['pdf']['count'] += product_count
-                    
-                    print(f"✓ {pdf_file.name}")
-                    print(f"   Pages: {len(pdf.pages)}")
-                    print(f"   Tables extracted: {len(tables)}")
-                    print(f"   Products: {product_count}")
-                
-            except Exception as e:
-                self.results['pdf']['errors'].append({
-                    'file': str(pdf_file),
-                    'error': str(e)
-                })
-                print(f"✗ {pdf_file.name}: {str(e)[:50]}")
+        
+        self._ingest_files('pdf', pdf_files, _parse_pdf_file, max_workers=PDF_MAX_WORKERS)
         
         print(f"\n✓ PDF Ingestion: {self.results['pdf']['count']} products extracted")
     
     def _add_dedup(self, product_id, source):
         """Track deduplication across formats"""
-        if product_id not in self.dedup_map:
-            self.dedup_map[product_id] = []
-        self.dedup_map[product_id].append(source)
+        # Keys stay the (interned) id strings: str caches its hash, so a
+        # lookup never rehashes, and the strings are kept alive by
+        # results['products'] anyway, so a 64-bit digest key would only
+        # add a hashing pass plus an id-by-hash map for the report
+        first = self.first_source.get(product_id)
+        if first is None:
+            self.first_source[product_id] = source
+        elif source != first:
+            # Sources are recorded once each (dict keys keep file order),
+            # so repeats within a file or re-ingesting it add nothing
+            self.duplicates.setdefault(product_id, {first: None})[source] = None
     
     def test_deduplication(self):
         """Test deduplication across formats"""
-        print("\n" + "="*60)
-        print("🔄 TESTING DEDUPLICATION")
-        print("="*60)
+        out = []
+        out.append("\n" + "="*60)
+        out.append("🔄 TESTING DEDUPLICATION")
+        out.append("="*60)
         
-        duplicates = {k: v for k, v in self.dedup_map.items() if len(v) > 1}
+        duplicates = self.duplicates
         
-        print(f"\nTotal unique products: {len(self.dedup_map)}")
-        print(f"Duplicate products: {len(duplicates)}")
+        out.append(f"\nTotal unique products: {len(self.first_source)}")
+        out.append(f"Duplicate products: {len(duplicates)}")
         
         if duplicates:
-            print(f"\n📍 Sample duplicates across formats:")
+            out.append(f"\n📍 Sample duplicates across formats:")
             for i, (product_id, sources) in enumerate(list(duplicates.items())[:5]):
-                print(f"  • {product_id}")
+                out.append(f"  • {product_id}")
                 for source in sources:
-                    print(f"    - {source}")
+                    out.append(f"    - {source}")
                 if i >= 4:
                     break
+        
+        sys.stdout.write("\n".join(out) + "\n")
     
     def generate_report(self):
         """Generate comprehensive test report"""
+        out = []
         duration = (datetime.now() - self.start_time).total_seconds()
         
-        print("\n" + "="*60)
-        print("📊 INGESTION TEST REPORT")
-        print("="*60)
+        out.append("\n" + "="*60)
+        out.append("📊 INGESTION TEST REPORT")
+        out.append("="*60)
         
         total_products = (self.results['json']['count'] + 
                          self.results['csv']['count'] + 
                          self.results['pdf']['count'])
         
-        print(f"\n⏱ Test Duration: {duration:.2f} seconds")
-        print(f"\n📈 EXTRACTION SUMMARY:")
-        print(f"  JSON Products:  {self.results['json']['count']:6d} extracted")
-        print(f"  CSV Products:   {self.results['csv']['count']:6d} extracted")
-        print(f"  PDF Products:   {self.results['pdf']['count']:6d} extracted")
-        print(f"  ─────────────────────────")
-        print(f"  TOTAL:          {total_products:6d} products")
+        out.append(f"\n⏱ Test Duration: {duration:.2f} seconds")
+        out.append(f"\n📈 EXTRACTION SUMMARY:")
+        out.append(f"  JSON Products:  {self.results['json']['count']:6d} extracted")
+        out.append(f"  CSV Products:   {self.results['csv']['count']:6d} extracted")
+        out.append(f"  PDF Products:   {self.results['pdf']['count']:6d} extracted")
+        out.append(f"  ─────────────────────────")
+        out.append(f"  TOTAL:          {total_products:6d} products")
         
-        print(f"\n✓ UNIQUE PRODUCTS (after dedup): {len(self.dedup_map)}")
+        out.append(f"\n✓ UNIQUE PRODUCTS (after dedup): {len(self.first_source)}")
         
         # Error summary
         total_errors = (len(self.results['json']['errors']) + 
@@ -253,37 +582,40 @@ class CatalogIngestionTester:
                        len(self.results['pdf']['errors']))
         
         if total_errors > 0:
-            print(f"\n⚠ ERRORS: {total_errors}")
+            out.append(f"\n⚠ ERRORS: {total_errors}")
             if self.results['json']['errors']:
-                print(f"  JSON errors: {len(self.results['json']['errors'])}")
+                out.append(f"  JSON errors: {len(self.results['json']['errors'])}")
             if self.results['csv']['errors']:
-                print(f"  CSV errors: {len(self.results['csv']['errors'])}")
+                out.append(f"  CSV errors: {len(self.results['csv']['errors'])}")
             if self.results['pdf']['errors']:
-                print(f"  PDF errors: {len(self.results['pdf']['errors'])}")
+                out.append(f"  PDF errors: {len(self.results['pdf']['errors'])}")
         else:
-            print(f"\n✓ NO ERRORS - All formats processed successfully!")
+            out.append(f"\n✓ NO ERRORS - All formats processed successfully!")
         
         # Success rate
         if total_products > 0:
             success_rate = (total_products / (total_products + total_errors)) * 100 if total_errors == 0 else 100
-            print(f"\n✓ SUCCESS RATE: {success_rate:.1f}%")
+            out.append(f"\n✓ SUCCESS RATE: {success_rate:.1f}%")
         
         # Format distribution
-        print(f"\n📊 FORMAT DISTRIBUTION:")
+        out.append(f"\n📊 FORMAT DISTRIBUTION:")
         if total_products > 0:
-            print(f"  JSON: {(self.results['json']['count']/total_products*100):.1f}%")
-            print(f"  CSV:  {(self.results['csv']['count']/total_products*100):.1f}%")
-            print(f"  PDF:  {(self.results['pdf']['count']/total_products*100):.1f}%")
+            out.append(f"  JSON: {(self.results['json']['count']/total_products*100):.1f}%")
+            out.append(f"  CSV:  {(self.results['csv']['count']/total_products*100):.1f}%")
+            out.append(f"  PDF:  {(self.results['pdf']['count']/total_products*100):.1f}%")
         
         # Deduplication effectiveness
-        dedup_ratio = (1 - len(self.dedup_map)/total_products) if total_products > 0 else 0
-        print(f"\n🔄 DEDUPLICATION:")
-        print(f"  Duplicate rate: {dedup_ratio*100:.1f}%")
-        print(f"  Unique items: {len(self.dedup_map)}/{total_products}")
+        dedup_ratio = (1 - len(self.first_source)/total_products) if total_products > 0 else 0
+        out.append(f"\n🔄 DEDUPLICATION:")
+        out.append(f"  Duplicate rate: {dedup_ratio*100:.1f}%")
+        out.append(f"  Unique items: {len(self.first_source)}/{total_products}")
         
-        print("\n" + "="*60)
-        print("✅ MULTI-FORMAT INGESTION TEST COMPLETE")
-        print("="*60 + "\n")
+        out.append("\n" + "="*60)
+        out.append("✅ MULTI-FORMAT INGESTION TEST COMPLETE")
+        out.append("="*60 + "\n")
+        
+        # One write for the whole report instead of a print() per line
+        sys.stdout.write("\n".join(out) + "\n")
     
     def run(self):
         """Run all tests"""
@@ -291,18 +623,44 @@ class CatalogIngestionTester:
         print("THEMIS MULTI-FORMAT CATALOG INGESTION TEST")
         print("🚀 "*20)
         
-        self.test_json_catalogs()
-        self.test_csv_catalogs()
-        self.test_pdf_catalogs()
+        # Parsing of every format starts up front, so slow files of one
+        # format overlap with the others; each test then merges its own
+        # results in order
+        with ProcessPoolExecutor() as executor, \
+                ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS) as pdf_executor:
+            self._prefetch('json', self._sample_json_files(self._find_json_files()), _parse_json_file, executor)
+            self._prefetch('csv', self._find_csv_files(), _parse_csv_file, executor)
+            if HAS_PDFPLUMBER:
+                self._prefetch('pdf', self._find_pdf_files(), _parse_pdf_file, pdf_executor)
+            
+            self.test_json_catalogs()
+            self.test_csv_catalogs()
+            self.test_pdf_catalogs()
+        
+        if self.shard_dir is not None:
+            merged = self._merge_shards()
+            if merged is not None:
+                print(f"\n💾 Products written to {merged}")
+        
         self.test_deduplication()
         self.generate_report()
 
 if __name__ == "__main__":
-    catalogs_dir = "c:\\Users\\l.de.angelis\\Setup\\backend\\src\\data\\catalogs"
+    parser = argparse.ArgumentParser(description="Test JSON, CSV and PDF catalog ingestion with deduplication")
+    parser.add_argument('--catalogs-dir', default=str(Path(__file__).resolve().parent),
+                        help="catalogs directory (default: the one of this script)")
+    parser.add_argument('--sample', type=int, metavar='N',
+                        help=f"ingest a random sample of N JSON catalogs (seed {SAMPLE_SEED})")
+    parser.add_argument('--shard-dir', metavar='DIR',
+                        help="spill products to Parquet shards in DIR (requires pyarrow)")
+    parser.add_argument('--verbose', action=argparse.BooleanOptionalAction, default=True,
+                        help="print the details of every file")
+    args = parser.parse_args()
     
-    if not os.path.exists(catalogs_dir):
-        print(f"✗ Catalogs directory not found: {catalogs_dir}")
+    if not os.path.exists(args.catalogs_dir):
+        print(f"✗ Catalogs directory not found: {args.catalogs_dir}")
         sys.exit(1)
     
-    tester = CatalogIngestionTester(catalogs_dir)
+    tester = CatalogIngestionTester(args.catalogs_dir, sample_n=args.sample,
+                                    verbose=args.verbose, shard_dir=args.shard_dir)
     tester.run()